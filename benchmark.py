@@ -0,0 +1,111 @@
+"""Benchmarks for the headless Indigram core.
+
+Usage:
+    python benchmark.py oracle [--users 300 1000 20000] [--queries 200]
+    python benchmark.py bfs [--users 20000 200000] [--queries 20]
+"""
+import argparse
+import copy
+import math
+import random
+import time
+
+from csr_graph import CSRAdjacency
+from social_network import SocialNetwork
+
+
+def timed(function, *args, **kwargs):
+    """Run function once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmark_oracle(args):
+    """Distance index construction cost and lookup speed against plain searches"""
+    print(f"{'users':>8} {'index':>9} {'build s':>9} {'MB':>7} {'exact %':>8} "
+          f"{'lookup us':>10} {'bfs us':>10} {'bidir us':>10}")
+    for num_users in args.users:
+        network = SocialNetwork(num_users, seed=args.seed)
+        rng = random.Random(args.seed)
+        pairs = [(rng.randrange(num_users), rng.randrange(num_users)) for _ in range(args.queries)]
+
+        index, build_time = timed(network.build_distance_index)
+        answers, lookup_time = timed(lambda: [index.distance(s, t) for s, t in pairs])
+        _, bfs_time = timed(lambda: [network.bfs_shortest_path(s, t) for s, t in pairs])
+        _, bidirectional_time = timed(lambda: [network.bidirectional_bfs_path(s, t) for s, t in pairs])
+
+        exact = sum(answer is not None for answer in answers) / len(pairs)
+        per_query = 1e6 / len(pairs)
+        print(f"{num_users:>8} {'matrix' if index.exact else 'landmark':>9} {build_time:>9.2f} "
+              f"{index.nbytes / 1e6:>7.2f} {exact * 100:>7.0f}% {lookup_time * per_query:>10.1f} "
+              f"{bfs_time * per_query:>10.1f} {bidirectional_time * per_query:>10.1f}")
+
+
+def dense_region(network: SocialNetwork) -> SocialNetwork:
+    """The network restricted to its dense region, renumbered from 0.
+
+    Membership is recomputed from the grid layout in generate_network: the
+    top-left 30% of rows and columns.
+    """
+    num_users = len(network.users)
+    grid_cols = int(math.sqrt(num_users)) + 2
+    grid_rows = int(math.ceil(num_users / grid_cols))
+    members = [user_id for user_id in range(num_users)
+               if user_id // grid_cols < grid_rows * 0.3 and user_id % grid_cols < grid_cols * 0.3]
+    new_ids = {user_id: new_id for new_id, user_id in enumerate(members)}
+    edges = [(new_ids[a], new_ids[b]) for a, b in network.connections.edges() if a in new_ids and b in new_ids]
+
+    # The searches only read the adjacency, so a shallow copy can carry the subgraph
+    dense = copy.copy(network)
+    dense.connections = CSRAdjacency.from_edges(len(members), [a for a, _ in edges], [b for _, b in edges])
+    return dense
+
+
+def benchmark_bfs(args):
+    """Direction-optimizing BFS against the level-by-level BFS on mixed and dense graphs"""
+    print(f"{'users':>8} {'graph':>6} {'nodes':>8} {'degree':>7} {'bfs ms':>9} "
+          f"{'numpy ms':>9} {'python ms':>10} {'speedup':>8}")
+    for num_users in args.users:
+        network = SocialNetwork(num_users, seed=args.seed)
+        for name, graph in (("mixed", network), ("dense", dense_region(network))):
+            num_nodes = len(graph.connections)
+            rng = random.Random(args.seed)
+            pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(args.queries)]
+
+            baseline, bfs_time = timed(lambda: [graph.bfs_shortest_path(s, t)[0] for s, t in pairs])
+            timings = []
+            for backend in ("numpy", "python"):
+                graph.backend = backend
+                paths, elapsed = timed(lambda: [graph.frontier_bfs_path(s, t)[0] for s, t in pairs])
+                if [len(path) for path in paths] != [len(path) for path in baseline]:
+                    raise AssertionError(f"{backend} frontier BFS found a different path length")
+                timings.append(elapsed)
+
+            per_query = 1e3 / len(pairs)
+            print(f"{num_users:>8} {name:>6} {num_nodes:>8} {2 * graph.connections.num_edges / num_nodes:>7.1f} "
+                  f"{bfs_time * per_query:>9.1f} {timings[0] * per_query:>9.1f} "
+                  f"{timings[1] * per_query:>10.1f} {bfs_time / timings[0]:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1, help="network and query seed")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    oracle = subparsers.add_parser("oracle", help="distance index build and lookup times")
+    oracle.add_argument("--users", type=int, nargs="+", default=[300, 1000, 20000])
+    oracle.add_argument("--queries", type=int, default=200)
+    oracle.set_defaults(run=benchmark_oracle)
+
+    bfs = subparsers.add_parser("bfs", help="direction-optimizing BFS against plain BFS")
+    bfs.add_argument("--users", type=int, nargs="+", default=[20000, 200000])
+    bfs.add_argument("--queries", type=int, default=20)
+    bfs.set_defaults(run=benchmark_bfs)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
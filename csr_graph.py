@@ -0,0 +1,141 @@
+"""Compressed sparse row (CSR) adjacency for the social network.
+
+Every neighbour list is packed back to back into one ``array('i')`` and a
+second array of offsets marks where each node's list starts, so an edge
+costs two 4-byte entries instead of four Python set slots holding boxed
+ints. Node ``i``'s neighbours are ``neighbors[offsets[i]:offsets[i + 1]]``.
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Iterable, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up packing large edge lists
+    np = None
+
+
+class EdgeList:
+    """Append-only list of undirected edges, collected while a graph is built"""
+
+    def __init__(self):
+        self.sources = array('i')
+        self.targets = array('i')
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def add(self, source: int, target: int):
+        self.sources.append(source)
+        self.targets.append(target)
+
+    def extend(self, sources: Iterable[int], targets: Iterable[int]):
+        """Append many edges at once; NumPy arrays are copied without a Python loop"""
+        if np is not None and isinstance(sources, np.ndarray):
+            self.sources.frombytes(sources.astype(np.int32).tobytes())
+            self.targets.frombytes(np.asarray(targets).astype(np.int32).tobytes())
+        else:
+            self.sources.extend(sources)
+            self.targets.extend(targets)
+
+
+class CSRAdjacency(Mapping):
+    """Undirected adjacency in CSR form, usable as a read-only {node: neighbors} mapping.
+
+    Each edge is stored once per direction and every neighbour list is
+    sorted, so membership tests are a binary search. Looking up a node
+    returns a small ``array('i')`` copy of its neighbour list.
+    """
+
+    def __init__(self, offsets: array, neighbors: array):
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, sources: Iterable[int], targets: Iterable[int]) -> "CSRAdjacency":
+        """Pack undirected (source, target) pairs, dropping self loops and duplicates"""
+        if np is not None:
+            src = np.asarray(sources, dtype=np.int64)
+            dst = np.asarray(targets, dtype=np.int64)
+            keep = src != dst
+            src, dst = src[keep], dst[keep]
+
+            # Both directions, sorted by (source, target) with duplicates removed
+            stride = max(num_nodes, 1)
+            keys = np.unique(np.concatenate((src * stride + dst, dst * stride + src)))
+            offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // stride, minlength=num_nodes), out=offsets[1:])
+            return cls(array('q', offsets.tobytes()),
+                       array('i', (keys % stride).astype(np.int32).tobytes()))
+
+        adjacency = [set() for _ in range(num_nodes)]
+        for source, target in zip(sources, targets):
+            if source != target:
+                adjacency[source].add(target)
+                adjacency[target].add(source)
+
+        offsets = array('q', [0])
+        neighbors = array('i')
+        for node_neighbors in adjacency:
+            neighbors.extend(sorted(node_neighbors))
+            offsets.append(len(neighbors))
+        return cls(offsets, neighbors)
+
+    def __getitem__(self, node: int) -> array:
+        if not 0 <= node < len(self.offsets) - 1:
+            raise KeyError(node)
+        return self.neighbors[self.offsets[node]:self.offsets[node + 1]]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.offsets) - 1))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        """Number of undirected edges"""
+        return len(self.neighbors) // 2
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the two arrays"""
+        return (len(self.offsets) * self.offsets.itemsize +
+                len(self.neighbors) * self.neighbors.itemsize)
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def has_edge(self, node: int, other: int) -> bool:
+        start, end = self.offsets[node], self.offsets[node + 1]
+        index = bisect_left(self.neighbors, other, start, end)
+        return index < end and self.neighbors[index] == other
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """Yield each undirected edge once as (lower id, higher id)"""
+        offsets = self.offsets
+        neighbors = self.neighbors
+        for node in range(len(offsets) - 1):
+            for other in neighbors[offsets[node]:offsets[node + 1]]:
+                if node < other:
+                    yield node, other
+
+    def add_edge(self, node: int, other: int) -> bool:
+        """Insert an undirected edge, returning False if it already exists.
+
+        This shifts the tail of both arrays, so it is meant for occasional
+        edits after the graph has been built rather than for bulk loading.
+        """
+        if node == other or self.has_edge(node, other):
+            return False
+        self._insert(node, other)
+        self._insert(other, node)
+        return True
+
+    def _insert(self, node: int, other: int):
+        start, end = self.offsets[node], self.offsets[node + 1]
+        self.neighbors.insert(bisect_left(self.neighbors, other, start, end), other)
+        offsets = self.offsets
+        for index in range(node + 1, len(offsets)):
+            offsets[index] += 1
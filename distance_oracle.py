@@ -0,0 +1,168 @@
+"""Precomputed hop distances for instant degrees-of-separation lookups.
+
+Small graphs get an exact all-pairs matrix with one byte per pair, filled
+by one BFS per user. Large graphs get landmark distances instead: a BFS
+from a handful of well-spread landmarks bounds every pair through the
+triangle inequality, and component labels answer disconnected pairs
+outright. Bounds are rarely tight for random pairs, so callers fall back
+to a search when ``distance`` returns None.
+"""
+from array import array
+from typing import List, Optional, Tuple
+
+from csr_graph import CSRAdjacency
+from frontier_bfs import frontier_bfs_levels
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy every BFS runs the plain loop below
+    np = None
+
+# Marks "not reachable" in the one-byte distance tables
+UNREACHABLE = 255
+
+# Graphs up to this size get the exact matrix (n * n bytes, 1 MB at 1000 users)
+ALL_PAIRS_MAX_NODES = 1000
+DEFAULT_LANDMARKS = 16
+
+# From this size bfs_distances runs the NumPy direction-optimizing BFS; below
+# it the per-level array overhead outweighs the savings
+FRONTIER_MIN_NODES = 1000
+
+
+def connected_components(adjacency: CSRAdjacency) -> array:
+    """Component label for every node (labels are the smallest node id in the component)"""
+    offsets = adjacency.offsets
+    neighbors = adjacency.neighbors
+    labels = array('i', [-1]) * len(adjacency)
+    for root in range(len(adjacency)):
+        if labels[root] != -1:
+            continue
+        labels[root] = root
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                if labels[neighbor] == -1:
+                    labels[neighbor] = root
+                    stack.append(neighbor)
+    return labels
+
+
+def bfs_distances(adjacency: CSRAdjacency, source: int) -> bytearray:
+    """Hop distance from source to every node, UNREACHABLE where there is no path"""
+    if np is not None and len(adjacency) >= FRONTIER_MIN_NODES:
+        distances = np.full(len(adjacency), UNREACHABLE, dtype=np.uint8)
+        for depth, level in enumerate(frontier_bfs_levels(adjacency, source, backend="numpy")):
+            distances[np.frombuffer(level, dtype=np.int32)] = min(depth, UNREACHABLE - 1)
+        return bytearray(distances.tobytes())
+
+    offsets = adjacency.offsets
+    neighbors = adjacency.neighbors
+    distances = bytearray([UNREACHABLE]) * len(adjacency)
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier:
+        # Distances past 254 saturate; separation never gets near that
+        depth = min(depth + 1, UNREACHABLE - 1)
+        next_frontier = []
+        for node in frontier:
+            for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = depth
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances
+
+
+def level_counts(distances: bytearray) -> List[int]:
+    """Number of nodes at each hop distance, from 0 (the source) to the farthest reachable"""
+    counts = []
+    # BFS levels are contiguous, so the first empty one ends the search
+    for distance in range(UNREACHABLE):
+        count = distances.count(distance)
+        if not count:
+            break
+        counts.append(count)
+    return counts
+
+
+class DistanceOracle:
+    def __init__(self, adjacency: CSRAdjacency, max_exact_nodes: int = ALL_PAIRS_MAX_NODES,
+                 num_landmarks: int = DEFAULT_LANDMARKS):
+        """Build the exact matrix for small graphs, landmark tables otherwise"""
+        self.num_nodes = len(adjacency)
+        self.exact = self.num_nodes <= max_exact_nodes
+        self.matrix = bytearray()
+        self.components = array('i')
+        self.landmarks: List[int] = []
+        self.landmark_distances: List[bytearray] = []
+
+        if self.exact:
+            for source in range(self.num_nodes):
+                self.matrix += bfs_distances(adjacency, source)
+        elif self.num_nodes:
+            # Component labels answer "not connected" exactly
+            self.components = connected_components(adjacency)
+            self._choose_landmarks(adjacency, num_landmarks)
+
+    def _choose_landmarks(self, adjacency: CSRAdjacency, num_landmarks: int):
+        """Pick landmarks by farthest-point sampling, starting at the best-connected user.
+
+        All landmarks sit in the component of that first user, which in these
+        networks holds nearly everyone; pairs elsewhere fall back to a search.
+        """
+        landmark = max(range(self.num_nodes), key=adjacency.degree)
+        # Distance from every node to its closest landmark so far
+        closest = bfs_distances(adjacency, landmark)
+        reachable = [node for node, distance in enumerate(closest) if distance != UNREACHABLE]
+        for _ in range(min(num_landmarks, len(reachable))):
+            distances = bfs_distances(adjacency, landmark)
+            self.landmarks.append(landmark)
+            self.landmark_distances.append(distances)
+            for node in reachable:
+                if distances[node] < closest[node]:
+                    closest[node] = distances[node]
+            landmark = max(reachable, key=closest.__getitem__)
+            if closest[landmark] == 0:
+                break
+
+    def bounds(self, source: int, target: int) -> Tuple[int, Optional[int]]:
+        """Lower and upper bound on the hop distance (upper is None when unknown).
+
+        Returns (-1, -1) when the two users are known to be disconnected.
+        """
+        if source == target:
+            return 0, 0
+        if self.exact:
+            exact = self.distance(source, target)
+            return exact, exact
+
+        if self.components[source] != self.components[target]:
+            return -1, -1
+
+        lower, upper = 0, None
+        for distances in self.landmark_distances:
+            source_distance, target_distance = distances[source], distances[target]
+            if source_distance == UNREACHABLE:
+                # Landmarks only cover one component
+                break
+            lower = max(lower, abs(source_distance - target_distance))
+            through = source_distance + target_distance
+            if upper is None or through < upper:
+                upper = through
+        return lower, upper
+
+    def distance(self, source: int, target: int) -> Optional[int]:
+        """Exact hop distance, -1 if unreachable, or None if the landmarks can't tell"""
+        if self.exact:
+            distance = self.matrix[source * self.num_nodes + target]
+            return -1 if distance == UNREACHABLE else distance
+        lower, upper = self.bounds(source, target)
+        return lower if lower == upper else None
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.matrix) + len(self.components) * self.components.itemsize +
+                sum(len(distances) for distances in self.landmark_distances))
@@ -0,0 +1,230 @@
+"""Direction-optimizing BFS over the CSR adjacency.
+
+Instead of a dict of parents, one flat array (NumPy, or ``array('i')``
+without it) holds the hop distance of every reached node. Each level is expanded in one
+of two directions:
+
+- top-down: scan the neighbours of every frontier node (cheap while the
+  frontier is small)
+- bottom-up: every unvisited node scans its own neighbours and stops at the
+  first one in the frontier (cheap once the frontier covers a large part
+  of the graph, as it quickly does in the dense region)
+
+The switch follows Beamer et al.: go bottom-up when the frontier's edges
+outnumber the unvisited nodes' edges / ALPHA, and back to top-down once
+the frontier shrinks below num_nodes / BETA.
+
+Paths are rebuilt from the distances, stepping to the smallest-id
+neighbour one level closer to the source, so they are the same whichever
+direction or backend ran. Levels are yielded in id order. The pure-Python
+backend stops scanning as soon as it reaches the target, so its last
+level can be shorter than the NumPy one, which always expands whole
+levels.
+"""
+from array import array
+from typing import Generator, List, Optional, Sequence
+
+from csr_graph import CSRAdjacency
+
+try:
+    import numpy as np
+except ImportError:  # The python backend needs nothing beyond the stdlib
+    np = None
+
+# Direction switch thresholds (Beamer, Asanovic and Patterson, SC'12)
+ALPHA = 1
+BETA = 24
+
+# Top-down levels larger than num_nodes / SORT_FRACTION are collected with a
+# scan over all nodes instead of a sort
+SORT_FRACTION = 16
+
+
+def frontier_bfs_levels(adjacency: CSRAdjacency, source: int, target: Optional[int] = None,
+                        backend: str = "auto") -> Generator[Sequence[int], None, List[int]]:
+    """BFS from source yielding each level as a sorted ``array('i')``.
+
+    With a target, the last level yielded stops at the target and the path
+    is the generator's return value (empty if unreachable). Without one the
+    whole component is traversed and the return value is empty.
+    ``backend`` is "numpy", "python" or "auto".
+    """
+    if backend == "auto":
+        backend = "numpy" if np is not None else "python"
+    if backend == "numpy":
+        return _numpy_levels(adjacency, source, target)
+    return _python_levels(adjacency, source, target)
+
+
+def _build_path(adjacency: CSRAdjacency, depths: Sequence[int], target: int) -> List[int]:
+    """Walk back from target, stepping to the smallest-id neighbour one level up"""
+    offsets = adjacency.offsets
+    neighbors = adjacency.neighbors
+    path = [target]
+    for depth in range(int(depths[target]) - 1, -1, -1):
+        node = path[-1]
+        for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+            if depths[neighbor] == depth:
+                path.append(neighbor)
+                break
+    path.reverse()
+    return path
+
+
+def _numpy_levels(adjacency: CSRAdjacency, source: int,
+                  target: Optional[int]) -> Generator[Sequence[int], None, List[int]]:
+    num_nodes = len(adjacency)
+    degrees = np.diff(_csr_views(adjacency)[0])
+
+    # Hop distance of every reached node, -1 while unvisited
+    depths = np.full(num_nodes, -1, dtype=np.int32)
+    depths[source] = 0
+    frontier = np.array([source], dtype=np.int32)
+    unvisited_edges = int(degrees.sum()) - int(degrees[source])
+    # Only built for bottom-up steps, then shrunk as nodes are reached
+    unvisited = None
+
+    yield array('i', [source])
+    if source == target:
+        return [source]
+
+    depth = 0
+    while frontier.size:
+        depth += 1
+        offsets, neighbors = _csr_views(adjacency)
+        frontier_edges = int(degrees[frontier].sum())
+        if frontier_edges > unvisited_edges / ALPHA or (unvisited is not None and frontier.size >= num_nodes / BETA):
+            if unvisited is None:
+                unvisited = np.flatnonzero(depths < 0).astype(np.int32)
+            level, unvisited = _bottom_up(offsets, neighbors, depths, depth, unvisited)
+        else:
+            unvisited = None
+            level = _top_down(offsets, neighbors, depths, depth, frontier)
+        offsets = neighbors = None
+        unvisited_edges -= int(degrees[level].sum())
+
+        if target is not None and depths[target] >= 0:
+            yield array('i', level[:np.searchsorted(level, target) + 1].tobytes())
+            return _build_path(adjacency, depths, target)
+        if level.size:
+            yield array('i', level.tobytes())
+        frontier = level
+
+    return []
+
+
+def _csr_views(adjacency: CSRAdjacency):
+    """NumPy views of the CSR arrays.
+
+    Taken afresh for every level and dropped before it is yielded: an array
+    exporting its buffer cannot grow, so a view held by a suspended search
+    would make add_connection fail.
+    """
+    return (np.frombuffer(adjacency.offsets, dtype=np.int64),
+            np.frombuffer(adjacency.neighbors, dtype=np.int32))
+
+
+def _top_down(offsets, neighbors, depths, depth, frontier):
+    """Mark and return the unvisited neighbours of the frontier, sorted"""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    # Index of every neighbour slot of every frontier node
+    slots = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    reached = neighbors[slots]
+    reached = reached[depths[reached] < 0]
+    depths[reached] = depth
+    if reached.size * SORT_FRACTION < len(depths):
+        return np.unique(reached)
+    # Big levels: one pass over all nodes is cheaper than sorting
+    return np.flatnonzero(depths == depth).astype(np.int32)
+
+
+def _bottom_up(offsets, neighbors, depths, depth, unvisited):
+    """Mark unvisited nodes that have a frontier neighbour; returns (level, still unvisited).
+
+    Every unvisited node checks its neighbours one rank at a time: first
+    neighbours of all nodes, then second neighbours of those still
+    unmatched, and so on, so each node stops scanning at its first hit.
+    """
+    remaining = unvisited
+    positions = offsets[remaining]
+    ends = offsets[remaining + 1]
+    while remaining.size:
+        live = positions < ends
+        if not live.all():
+            remaining, positions, ends = remaining[live], positions[live], ends[live]
+        hit = depths[neighbors[positions]] == depth - 1
+        depths[remaining[hit]] = depth
+        miss = ~hit
+        remaining, positions, ends = remaining[miss], positions[miss] + 1, ends[miss]
+
+    reached = depths[unvisited] == depth
+    return unvisited[reached], unvisited[~reached]
+
+
+def _python_levels(adjacency: CSRAdjacency, source: int,
+                   target: Optional[int]) -> Generator[Sequence[int], None, List[int]]:
+    offsets = adjacency.offsets
+    neighbors = adjacency.neighbors
+    num_nodes = len(adjacency)
+
+    depths = array('i', [-1]) * num_nodes
+    depths[source] = 0
+    frontier = array('i', [source])
+    frontier_edges = adjacency.degree(source)
+    unvisited_edges = offsets[num_nodes] - frontier_edges
+    unvisited: Optional[List[int]] = None
+
+    yield array('i', [source])
+    if source == target:
+        return [source]
+
+    depth = 0
+    while frontier:
+        depth += 1
+        level = array('i')
+        level_edges = 0
+        if frontier_edges > unvisited_edges / ALPHA or (unvisited is not None and len(frontier) >= num_nodes / BETA):
+            if unvisited is None:
+                unvisited = [node for node in range(num_nodes) if depths[node] < 0]
+            still_unvisited = []
+            for node in unvisited:
+                start, end = offsets[node], offsets[node + 1]
+                for neighbor in neighbors[start:end]:
+                    if depths[neighbor] == depth - 1:
+                        depths[node] = depth
+                        level.append(node)
+                        level_edges += end - start
+                        break
+                else:
+                    still_unvisited.append(node)
+                    continue
+                if node == target:
+                    break
+            unvisited = still_unvisited
+        else:
+            unvisited = None
+            for node in frontier:
+                for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                    if depths[neighbor] < 0:
+                        depths[neighbor] = depth
+                        level.append(neighbor)
+                        level_edges += offsets[neighbor + 1] - offsets[neighbor]
+                        if neighbor == target:
+                            break
+                else:
+                    continue
+                # Found the target; the rest of the level is not needed
+                break
+            level = array('i', sorted(level))
+        unvisited_edges -= level_edges
+
+        if target is not None and depths[target] >= 0:
+            yield level[:level.index(target) + 1]
+            return _build_path(adjacency, depths, target)
+        if level:
+            yield level
+        frontier = level
+        frontier_edges = level_edges
+
+    return []
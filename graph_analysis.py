@@ -0,0 +1,218 @@
+"""Batch degrees-of-separation analysis over many source users.
+
+Runs one BFS per source (every user, or a random sample on large graphs)
+and reduces the results to a separation histogram, per-source
+eccentricities, the diameter and the average path length. Sources are
+split into chunks across a process pool. The CSR arrays are copied once
+into shared memory and every worker reads them in place, so adding
+workers adds no per-worker copy of the graph.
+
+Usage:
+    python graph_analysis.py 100000 --sources 2000 --workers 8
+"""
+import argparse
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from csr_graph import CSRAdjacency
+from distance_oracle import UNREACHABLE, bfs_distances, level_counts
+
+# Chunks per worker; more chunks even out sources whose components differ in size
+CHUNKS_PER_WORKER = 4
+
+# (shared memory name, array typecode, length) for the offsets and neighbors arrays
+SharedLayout = Tuple[Tuple[str, str, int], Tuple[str, str, int]]
+
+
+class SeparationReport(NamedTuple):
+    """Merged results of a batch separation analysis"""
+    # histogram[d] is the number of (source, user) pairs d hops apart, self pairs excluded
+    histogram: List[int]
+    # Pairs with no path between them
+    unreachable: int
+    # Largest hop distance from each source to a user it can reach
+    eccentricities: Dict[int, int]
+    # True when every user was a source, so the figures are exact rather than estimates
+    exact: bool
+
+    @property
+    def num_pairs(self) -> int:
+        """Connected (source, user) pairs counted in the histogram"""
+        return sum(self.histogram)
+
+    @property
+    def diameter(self) -> int:
+        """Largest eccentricity; a lower bound when sources were sampled"""
+        return max(self.eccentricities.values(), default=0)
+
+    @property
+    def average_path_length(self) -> float:
+        """Mean hop distance over connected pairs"""
+        pairs = self.num_pairs
+        return sum(distance * count for distance, count in enumerate(self.histogram)) / pairs if pairs else 0.0
+
+    def eccentricity_distribution(self) -> List[Tuple[int, int]]:
+        """(eccentricity, number of sources) for every eccentricity that occurs"""
+        counts: Dict[int, int] = {}
+        for eccentricity in self.eccentricities.values():
+            counts[eccentricity] = counts.get(eccentricity, 0) + 1
+        return sorted(counts.items())
+
+
+class SharedAdjacency:
+    """The CSR arrays of an adjacency copied into shared memory blocks.
+
+    Use as a context manager; the blocks are released on exit. Worker
+    processes rebuild a read-only view with ``attach_adjacency(layout)``.
+    """
+
+    def __init__(self, adjacency: CSRAdjacency):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        layout = []
+        for values in (adjacency.offsets, adjacency.neighbors):
+            size = len(values) * values.itemsize
+            block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            block.buf[:size] = memoryview(values).cast('B')
+            self.blocks.append(block)
+            layout.append((block.name, values.typecode, len(values)))
+        self.layout: SharedLayout = tuple(layout)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+    def __enter__(self) -> "SharedAdjacency":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach_adjacency(layout: SharedLayout) -> Tuple[CSRAdjacency, List[shared_memory.SharedMemory]]:
+    """Read-only CSRAdjacency over shared memory blocks, plus the blocks keeping it alive.
+
+    The arrays are memoryviews, which the BFS code indexes and slices just
+    like ``array('i')``; nothing is copied.
+    """
+    blocks, views = [], []
+    for name, typecode, length in layout:
+        block = shared_memory.SharedMemory(name=name)
+        itemsize = array(typecode).itemsize
+        blocks.append(block)
+        views.append(block.buf[:length * itemsize].cast(typecode))
+    return CSRAdjacency(views[0], views[1]), blocks
+
+
+def analyze_sources(adjacency: CSRAdjacency, sources: Sequence[int]) -> Tuple[List[int], int, Dict[int, int]]:
+    """BFS from each source; returns (histogram, unreachable, eccentricities) for these sources only"""
+    histogram = [0]
+    unreachable = 0
+    eccentricities = {}
+    for source in sources:
+        distances = bfs_distances(adjacency, source)
+        unreachable += distances.count(UNREACHABLE)
+        counts = level_counts(distances)
+        eccentricities[source] = len(counts) - 1
+        if len(counts) > len(histogram):
+            histogram.extend([0] * (len(counts) - len(histogram)))
+        for distance in range(1, len(counts)):
+            histogram[distance] += counts[distance]
+    return histogram, unreachable, eccentricities
+
+
+# Set in each worker process by _attach_worker
+_worker_adjacency: Optional[CSRAdjacency] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _attach_worker(layout: SharedLayout):
+    global _worker_adjacency, _worker_blocks
+    _worker_adjacency, _worker_blocks = attach_adjacency(layout)
+
+
+def _analyze_chunk(sources: Sequence[int]) -> Tuple[List[int], int, Dict[int, int]]:
+    return analyze_sources(_worker_adjacency, sources)
+
+
+def analyze_separation(adjacency: CSRAdjacency, num_sources: Optional[int] = None,
+                       workers: Optional[int] = None,
+                       rng: Optional[random.Random] = None) -> SeparationReport:
+    """Separation statistics from every user, or from ``num_sources`` random users.
+
+    ``workers`` defaults to the CPU count; with one worker (or one chunk of
+    sources) everything runs in this process without shared memory.
+    """
+    num_users = len(adjacency)
+    exact = num_sources is None or num_sources >= num_users
+    sources = list(range(num_users)) if exact else (rng or random.Random()).sample(range(num_users), num_sources)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sources)))
+
+    if workers == 1:
+        results = [analyze_sources(adjacency, sources)]
+    else:
+        num_chunks = min(len(sources), workers * CHUNKS_PER_WORKER)
+        chunks = [sources[index::num_chunks] for index in range(num_chunks)]
+        with SharedAdjacency(adjacency) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                     initargs=(shared.layout,)) as executor:
+                results = list(executor.map(_analyze_chunk, chunks))
+
+    histogram = [0]
+    unreachable = 0
+    eccentricities = {}
+    for chunk_histogram, chunk_unreachable, chunk_eccentricities in results:
+        if len(chunk_histogram) > len(histogram):
+            histogram.extend([0] * (len(chunk_histogram) - len(histogram)))
+        for distance, count in enumerate(chunk_histogram):
+            histogram[distance] += count
+        unreachable += chunk_unreachable
+        eccentricities.update(chunk_eccentricities)
+    return SeparationReport(histogram, unreachable, eccentricities, exact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("users", type=int, help="number of users in the generated network")
+    parser.add_argument("--sources", type=int, help="random source users to sample (default: every user)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=1, help="network and sampling seed")
+    args = parser.parse_args()
+
+    # Imported here so worker processes only load the CSR and BFS code
+    from social_network import SocialNetwork
+
+    start = time.perf_counter()
+    network = SocialNetwork(args.users, seed=args.seed)
+    generated = time.perf_counter()
+    report = analyze_separation(network.connections, args.sources, args.workers, random.Random(args.seed))
+    analyzed = time.perf_counter()
+
+    num_sources = len(report.eccentricities)
+    print(f"Users: {args.users}  Connections: {network.connections.num_edges}  "
+          f"Sources: {num_sources}{'' if report.exact else ' (sampled)'}")
+    print(f"\n{'hops':>6} {'pairs':>14} {'share':>8}")
+    total = report.num_pairs + report.unreachable
+    for distance, count in enumerate(report.histogram):
+        if count:
+            print(f"{distance:>6} {count:>14} {count / total:>8.2%}")
+    if report.unreachable:
+        print(f"{'none':>6} {report.unreachable:>14} {report.unreachable / total:>8.2%}")
+
+    print(f"\n{'eccentricity':>12} {'sources':>10}")
+    for eccentricity, count in report.eccentricity_distribution():
+        print(f"{eccentricity:>12} {count:>10}")
+
+    print(f"\nDiameter: {report.diameter}{'' if report.exact else ' (lower bound)'}")
+    print(f"Average path length: {report.average_path_length:.3f}")
+    print(f"Generation: {generated - start:.2f}s  Analysis: {analyzed - generated:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
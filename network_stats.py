@@ -0,0 +1,124 @@
+"""Network statistics kept up to date as connections are added.
+
+Edge count, degree histogram, maximum degree and the number of connected
+components are computed once from the packed adjacency and then adjusted
+on every new edge in O(1) (amortised, for the union-find), so the panel
+and API callers never rescan the graph. The separation histogram needs
+BFS and is computed on demand by ``separation_histogram``.
+"""
+import random
+from array import array
+from typing import List, Optional, Tuple
+
+from csr_graph import CSRAdjacency
+from distance_oracle import UNREACHABLE, bfs_distances, connected_components, level_counts
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with union by size and path halving"""
+
+    def __init__(self, size: int):
+        self.parents = array('i', range(size))
+        self.sizes = array('i', [1]) * size
+
+    def find(self, node: int) -> int:
+        parents = self.parents
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    def union(self, node: int, other: int) -> bool:
+        """Merge the two sets, returning False if they were already one"""
+        root, other_root = self.find(node), self.find(other)
+        if root == other_root:
+            return False
+        if self.sizes[root] < self.sizes[other_root]:
+            root, other_root = other_root, root
+        self.parents[other_root] = root
+        self.sizes[root] += self.sizes[other_root]
+        return True
+
+    @classmethod
+    def from_labels(cls, labels: array) -> "UnionFind":
+        """Sets from component labels where each label is a member of its own component"""
+        union_find = cls(0)
+        union_find.parents = array('i', labels)
+        union_find.sizes = array('i', [0]) * len(labels)
+        for label in labels:
+            union_find.sizes[label] += 1
+        return union_find
+
+
+class NetworkStats:
+    def __init__(self, adjacency: CSRAdjacency):
+        """Compute all statistics from scratch (once, after generation)"""
+        self.num_users = len(adjacency)
+        self.num_edges = adjacency.num_edges
+
+        # degree_histogram[d] is the number of users with exactly d connections
+        self.degree_histogram: List[int] = [0]
+        for user_id in range(self.num_users):
+            self._count_degree(adjacency.degree(user_id), 1)
+
+        # One BFS labelling pass is cheaper than a union per edge
+        labels = connected_components(adjacency)
+        self.components = UnionFind.from_labels(labels)
+        self.num_components = sum(1 for user_id, label in enumerate(labels) if user_id == label)
+
+    def _count_degree(self, degree: int, change: int):
+        if degree >= len(self.degree_histogram):
+            self.degree_histogram.extend([0] * (degree + 1 - len(self.degree_histogram)))
+        self.degree_histogram[degree] += change
+
+    @property
+    def max_degree(self) -> int:
+        # The histogram only grows, so trailing zeros mean no user has that degree
+        degree = len(self.degree_histogram) - 1
+        while degree > 0 and self.degree_histogram[degree] == 0:
+            degree -= 1
+        return degree
+
+    @property
+    def average_degree(self) -> float:
+        return 2 * self.num_edges / self.num_users if self.num_users else 0.0
+
+    def add_edge(self, user_id: int, connected_id: int, user_degree: int, connected_degree: int):
+        """Account for a new edge; degrees are those after it was added"""
+        self.num_edges += 1
+        for degree in (user_degree, connected_degree):
+            self._count_degree(degree - 1, -1)
+            self._count_degree(degree, 1)
+        if self.components.union(user_id, connected_id):
+            self.num_components -= 1
+
+    def degree_distribution(self) -> List[Tuple[int, int]]:
+        """(degree, number of users) for every degree that occurs"""
+        return [(degree, count) for degree, count in enumerate(self.degree_histogram) if count]
+
+
+def separation_histogram(adjacency: CSRAdjacency, num_sources: Optional[int] = None,
+                         rng: Optional[random.Random] = None) -> Tuple[List[int], int]:
+    """Count user pairs by degrees of separation.
+
+    Runs BFS from every user, or from ``num_sources`` randomly chosen users
+    for an estimate on large graphs. Returns (histogram, unreachable) where
+    histogram[d] is the number of (source, user) pairs d hops apart, self
+    pairs excluded, and unreachable counts pairs with no path.
+    """
+    num_users = len(adjacency)
+    sources = range(num_users)
+    if num_sources is not None and num_sources < num_users:
+        sources = (rng or random.Random()).sample(range(num_users), num_sources)
+
+    histogram = [0] * UNREACHABLE
+    unreachable = 0
+    for source in sources:
+        distances = bfs_distances(adjacency, source)
+        unreachable += distances.count(UNREACHABLE)
+        for distance, count in enumerate(level_counts(distances)[1:], 1):
+            histogram[distance] += count
+
+    while len(histogram) > 1 and histogram[-1] == 0:
+        histogram.pop()
+    return histogram, unreachable
@@ -0,0 +1,217 @@
+"""Structure-of-arrays storage for user attributes.
+
+Coordinates, radii, selection flags and animation state (pulse phase and
+fade alpha) live in parallel ``array`` columns indexed by user id, so 100k+
+users take a few MB and a pass over every node walks contiguous memory.
+Animation state is advanced for all users in one batched step per frame. ``User`` is a slotted view
+onto one row; views are created on demand and hold no data of their own.
+"""
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Iterable, Iterator, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up bulk loading and batched updates
+    np = None
+
+USER_COLOR = (255, 140, 0)  # Saffron
+
+# Bits in NodeStore.flags
+FLAG_SELECTED = 1
+FLAG_TARGET = 2
+
+
+def _flag(bit: int) -> property:
+    """Boolean property backed by one bit of NodeStore.flags"""
+    def getter(self) -> bool:
+        return bool(self._store.flags[self.id] & bit)
+
+    def setter(self, value: bool):
+        flags = self._store.flags
+        flags[self.id] = flags[self.id] | bit if value else flags[self.id] & ~bit
+
+    return property(getter, setter)
+
+
+class User:
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store: "NodeStore", user_id: int):
+        self._store = store
+        self.id = user_id
+
+    @property
+    def x(self) -> float:
+        return self._store.xs[self.id]
+
+    @x.setter
+    def x(self, value: float):
+        self._store.xs[self.id] = value
+
+    @property
+    def y(self) -> float:
+        return self._store.ys[self.id]
+
+    @y.setter
+    def y(self, value: float):
+        self._store.ys[self.id] = value
+
+    @property
+    def radius(self) -> int:
+        return self._store.radii[self.id]
+
+    @radius.setter
+    def radius(self, value: int):
+        self._store.radii[self.id] = value
+
+    @property
+    def pulse_phase(self) -> float:
+        return self._store.pulse_phases[self.id]
+
+    @pulse_phase.setter
+    def pulse_phase(self, value: float):
+        self._store.pulse_phases[self.id] = value
+
+    is_selected = _flag(FLAG_SELECTED)
+    is_target = _flag(FLAG_TARGET)
+
+    @property
+    def name(self) -> str:
+        return self._store.name_of(self.id)
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        return USER_COLOR
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, User) and other._store is self._store and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"User(id={self.id}, name={self.name!r}, x={self.x:.1f}, y={self.y:.1f})"
+
+    def distance_to(self, other_x: float, other_y: float) -> float:
+        return math.sqrt((self.x - other_x) ** 2 + (self.y - other_y) ** 2)
+
+    def update_animation(self, dt: float):
+        self.pulse_phase += dt * 3
+        if self.pulse_phase > 2 * math.pi:
+            self.pulse_phase = 0
+
+
+class NodeStore(Mapping):
+    """Column storage for all users, usable as a read-only {user_id: User} mapping.
+
+    Names are not stored as strings: each user keeps the index of a base
+    name in ``name_table``, and users past the end of the table get a
+    numeric suffix (``Aarav1``, ``Aarav2`` ...).
+    """
+
+    def __init__(self, name_table: Sequence[str]):
+        self.name_table = name_table
+        self.name_index = array('H')
+        self.xs = array('d')
+        self.ys = array('d')
+        self.radii = array('B')
+        self.flags = array('B')
+        self.pulse_phases = array('d')
+        # 1.0 is fully drawn, 0.0 fully faded out
+        self.alphas = array('f')
+
+    def extend(self, name_index: Iterable[int], xs: Iterable[float], ys: Iterable[float],
+               radii: Iterable[int]):
+        """Append users in id order"""
+        for column, values in ((self.name_index, name_index), (self.xs, xs),
+                               (self.ys, ys), (self.radii, radii)):
+            if np is not None and isinstance(values, np.ndarray):
+                column.frombytes(values.astype(column.typecode).tobytes())
+            else:
+                column.extend(values)
+        missing = len(self.xs) - len(self.flags)
+        self.flags.frombytes(bytes(missing))
+        self.pulse_phases.frombytes(bytes(missing * self.pulse_phases.itemsize))
+        self.alphas.extend(array('f', [1.0]) * missing)
+
+    def scale_positions(self, scale_x: float, scale_y: float, origin_x: float = 0.0, origin_y: float = 0.0):
+        """Scale every position about (origin_x, origin_y), in place"""
+        for column, scale, origin in ((self.xs, scale_x, origin_x), (self.ys, scale_y, origin_y)):
+            if np is not None:
+                values = np.frombuffer(column, dtype=np.float64)
+                values -= origin
+                values *= scale
+                values += origin
+                del values  # release the buffer so the column can grow again
+            else:
+                column[:] = array('d', [origin + (value - origin) * scale for value in column])
+
+    def distances_from(self, user_id: int, user_ids: array) -> array:
+        """Euclidean distance from one user to each of user_ids (an array('i'))"""
+        x, y = self.xs[user_id], self.ys[user_id]
+        if np is not None:
+            ids = np.frombuffer(user_ids, dtype=np.int32)
+            distances = np.hypot(np.frombuffer(self.xs)[ids] - x, np.frombuffer(self.ys)[ids] - y)
+            return array('d', distances.tobytes())
+        xs, ys = self.xs, self.ys
+        return array('d', [math.hypot(xs[other] - x, ys[other] - y) for other in user_ids])
+
+    def advance_pulses(self, dt: float):
+        """Advance every user's pulse phase by dt seconds, wrapping at 2 pi"""
+        if np is not None:
+            phases = np.frombuffer(self.pulse_phases)
+            phases += dt * 3
+            np.remainder(phases, 2 * math.pi, out=phases)
+            del phases
+        else:
+            self.pulse_phases[:] = array('d', [(phase + dt * 3) % (2 * math.pi) for phase in self.pulse_phases])
+
+    def update_alphas(self, user_ids: array, starts: array, current_time: float, duration: float):
+        """Fade user_ids out over duration seconds from their start times.
+
+        Users not yet started or already done are fully drawn (alpha 1).
+        """
+        if np is not None:
+            ids = np.frombuffer(user_ids, dtype=np.int32)
+            progress = (current_time - np.frombuffer(starts)) / duration
+            alphas = np.frombuffer(self.alphas, dtype=np.float32)
+            alphas[ids] = np.where(progress >= 1.0, 1.0, np.clip(1.0 - progress, 0.0, 1.0))
+            del alphas
+        else:
+            alphas = self.alphas
+            for user_id, start in zip(user_ids, starts):
+                progress = (current_time - start) / duration
+                alphas[user_id] = 1.0 if progress >= 1.0 else min(1.0, max(0.0, 1.0 - progress))
+
+    def reset_alphas(self, user_ids: Iterable[int]):
+        for user_id in user_ids:
+            self.alphas[user_id] = 1.0
+
+    def name_of(self, user_id: int) -> str:
+        base_name = self.name_table[self.name_index[user_id]]
+        if user_id < len(self.name_table):
+            return base_name
+        return f"{base_name}{user_id - len(self.name_table) + 1}"
+
+    def clear_flags(self, user_id: int):
+        self.flags[user_id] = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the attribute columns"""
+        return sum(len(column) * column.itemsize for column in
+                   (self.name_index, self.xs, self.ys, self.radii, self.flags, self.pulse_phases,
+                    self.alphas))
+
+    def __getitem__(self, user_id: int) -> User:
+        if not 0 <= user_id < len(self.xs):
+            raise KeyError(user_id)
+        return User(self, user_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.xs)))
+
+    def __len__(self) -> int:
+        return len(self.xs)
@@ -0,0 +1,1022 @@
+"""Headless graph core for Indigram.
+
+This module holds the social network model and the BFS search. It does not
+import Pygame, so it can be used from batch workers and tests without a display.
+"""
+import heapq
+import math
+import random
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, List, Dict, Set, Generator, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; generation falls back to pure Python
+    np = None
+
+from csr_graph import CSRAdjacency, EdgeList
+from distance_oracle import DistanceOracle
+from frontier_bfs import frontier_bfs_levels
+from network_stats import NetworkStats, separation_histogram
+from node_store import NodeStore, User, USER_COLOR
+from spatial_index import GridIndex, SegmentIndex, nearest_neighbors_batch
+
+# Layout defaults used when no display size is supplied
+DEFAULT_WIDTH = 1600
+DEFAULT_HEIGHT = 1000
+PANEL_WIDTH = 450
+
+# Path search strategies understood by SocialNetwork.find_path
+SEARCH_MODES = ("bfs", "bidirectional", "tree", "frontier")
+
+# Number of (start, target) search results kept by SocialNetwork.cached_path
+PATH_CACHE_SIZE = 256
+
+# Returned by a level source whose next level is still being computed
+# elsewhere (see SocialNetwork.search_runner); playback waits for it
+LEVEL_PENDING: Sequence[int] = array('i')
+
+# Indian names for users; larger networks reuse them with a numeric suffix
+INDIAN_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Reyansh", "Muhammad", "Sai", "Krishna", "Atharv",
+    "Ishaan", "Shaurya", "Dhruv", "Aryan", "Yuvraj", "Harsh", "Dev", "Arnav", "Shivansh", "Kartik",
+    "Ananya", "Fatima", "Aadhya", "Diya", "Saanvi", "Myra", "Sara", "Aanya", "Pari", "Kavya",
+    "Priya", "Shreya", "Kiara", "Arya", "Riya", "Tara", "Zara", "Avni", "Ira", "Mahira",
+    "Rohan", "Ayaan", "Karan", "Kabir", "Om", "Ritik", "Tanishq", "Rudra", "Riaan", "Arman",
+    "Nisha", "Meera", "Rahul", "Vikram", "Amit", "Suresh", "Rajesh", "Neha", "Pooja", "Sunita",
+    "Aditi", "Sita", "Geeta", "Maya", "Kiran", "Ravi", "Ajay", "Vijay", "Sanjay", "Deepak",
+    "Kavita", "Mala", "Lata", "Rekha", "Shanti", "Gouri", "Kamala", "Radha", "Lakshmi", "Durga",
+    "Ganesh", "Shiva", "Rama", "Hanuman", "Bharath", "Ashwin", "Varun", "Surya", "Chandra", "Indra",
+    "Anjali", "Divya", "Sonal", "Preeti", "Vandana", "Monika", "Rashmi", "Swati", "Pallavi", "Madhuri",
+    "Akash", "Nikhil", "Tarun", "Manish", "Sachin", "Rohit", "Abhishek", "Vishal", "Sandeep", "Manoj",
+    "Sneha", "Manisha", "Shweta", "Jyoti", "Smita", "Renu", "Deepika", "Karishma", "Sapna", "Nidhi",
+    "Raman", "Prakash", "Mahesh", "Dinesh", "Naresh", "Mukesh", "Ramesh", "Yogesh", "Rajesh", "Sunil",
+    "Sonia", "Meena", "Kiran", "Usha", "Poonam", "Neeta", "Seema", "Geeta", "Rita", "Anita",
+    "Gaurav", "Sourav", "Ashish", "Nitish", "Harish", "Girish", "Jagdish", "Umesh", "Lokesh", "Rakesh",
+    "Kavitha", "Sangita", "Sunitha", "Mamta", "Pushpa", "Sharda", "Leela", "Veena", "Geetha", "Sita"
+]
+
+class SearchTree(NamedTuple):
+    """Result of one full BFS from a single source.
+    
+    ``order`` lists nodes in discovery order and level ``d`` is
+    ``order[level_starts[d]:level_starts[d + 1]]``. ``parents`` and
+    ``ranks`` (position in ``order``) are -1 for unreached nodes.
+    """
+    source: int
+    parents: array
+    ranks: array
+    order: array
+    level_starts: List[int]
+
+
+class SocialNetwork:
+    def __init__(self, num_users: int = 300, width: int = DEFAULT_WIDTH,
+                 height: int = DEFAULT_HEIGHT, panel_width: int = PANEL_WIDTH,
+                 seed: Optional[int] = None, backend: str = "auto",
+                 search_mode: str = "bfs", path_cache_size: int = PATH_CACHE_SIZE):
+        # Layout dimensions the network is generated for (window size incl. panel)
+        self.width = width
+        self.height = height
+        self.panel_width = panel_width
+        
+        # Random source for generation; pass a seed for a reproducible graph
+        self.rng = random.Random(seed)
+        
+        # Backend for generation and the frontier search: "numpy" (vectorized)
+        # or "python" (no dependencies)
+        if backend == "auto":
+            backend = "numpy" if np is not None else "python"
+        if backend not in ("numpy", "python"):
+            raise ValueError(f"Unknown backend {backend!r}, expected 'auto', 'numpy' or 'python'")
+        if backend == "numpy" and np is None:
+            raise ValueError("The numpy backend requires NumPy to be installed")
+        self.backend = backend
+        
+        self.users = NodeStore(INDIAN_NAMES)
+        # Adjacency is packed into CSR arrays once generation finishes; until
+        # then new edges are collected in _pending_edges
+        self.connections: CSRAdjacency = CSRAdjacency.from_edges(0, (), ())
+        self._pending_edges: Optional[EdgeList] = None
+        
+        # Edge count, degree histogram and components, kept current by add_connection
+        self.stats = NetworkStats(self.connections)
+        self._separation_histogram: Optional[Tuple[int, List[int], int]] = None
+        
+        # Optional precomputed distances, see build_distance_index()
+        self.distance_index: Optional[DistanceOracle] = None
+        self.selected_user: Optional[int] = None
+        self.target_user: Optional[int] = None
+        self.current_path = []  # Also sets path_index and path_edges
+        # Levels played so far; animation_levels is the total, None while a
+        # search is still running and the total is not known yet
+        self.bfs_animation: List[Sequence[int]] = []
+        self.animation_levels: Optional[int] = None
+        self.animation_step = 0
+        self.animation_speed = 0.3  # Slower for better visibility
+        self.last_animation_time = 0
+        self.path_found = False
+        self.degrees_of_separation = 0
+        self.nodes_explored = 0
+        
+        # Source of animation levels: a live search (search_pending) or a
+        # replay of a cached result. One level is pulled ahead of playback so
+        # the last one is known as soon as it is shown.
+        self._search: Optional[Iterator[Sequence[int]]] = None
+        self._search_key: Optional[Tuple[int, int, str, int]] = None
+        self._next_level: Optional[Sequence[int]] = None
+        self.search_pending = False
+        # Message of the exception that ended the last search, if it failed
+        self.search_error: Optional[str] = None
+        # Optional hook that takes a level generator and returns the level
+        # source to play, e.g. one running the search on a worker thread.
+        # The source may return LEVEL_PENDING and must support close().
+        self.search_runner: Optional[Callable[[Iterator[Sequence[int]]], Iterator[Sequence[int]]]] = None
+        
+        # Path search used for selections: one-sided "bfs", "bidirectional",
+        # "tree", which keeps a full BFS tree from the start user for later
+        # targets, or "frontier", the direction-optimizing BFS
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {search_mode!r}, expected one of {SEARCH_MODES}")
+        self.search_mode = search_mode
+        self.search_tree: Optional[SearchTree] = None
+        
+        # LRU cache of (path, animation steps) keyed by (start, target, search mode)
+        self.path_cache: "OrderedDict[Tuple[int, int, str], Tuple[List[int], List[Sequence[int]]]]" = OrderedDict()
+        self.path_cache_size = path_cache_size
+        self.path_cache_hits = 0
+        self.path_cache_misses = 0
+        
+        # BFS visualization states
+        self.bfs_visited_nodes: Set[int] = set()
+        self.current_exploring_nodes: Set[int] = set()
+        self.is_animating_bfs = False
+        self.bfs_complete = False
+        self.vanishing_nodes: Dict[int, float] = {}  # node_id: vanish_start_time
+        # Every node scheduled to vanish in the current animation, kept until
+        # all of them are done so renderers can treat their edges as dynamic
+        self.vanish_scheduled: frozenset = frozenset()
+        # The same nodes with their start times as arrays for the batched alpha
+        # update, and a min-heap of (start time, node) to find finished ones
+        self._vanish_ids = array('i')
+        self._vanish_starts = array('d')
+        self._vanish_heap: List[Tuple[float, int]] = []
+        self._last_frame_time: Optional[float] = None
+        self.vanish_delay = 1.0  # Delay before starting vanish animation
+        self.vanish_duration = 2.0  # Duration of vanish animation
+        self.show_final_path_time = 0
+        
+        # Bumped whenever edges or positions change, so renderers know when
+        # cached layers are stale
+        self.version = 0
+        
+        # Grids over users and edges for viewport queries, built on first use
+        self._user_grid: Optional[GridIndex] = None
+        self._edge_grid: Optional[SegmentIndex] = None
+        self._edge_ends: Tuple[array, array] = (array('i'), array('i'))
+        self._max_radius = 0
+        self._grid_version = -1
+        # The grids keep the positions they were built with; rescale_layout
+        # only accumulates its stretch here and queries undo it
+        self._grid_scale = (1.0, 1.0)
+        
+        self.generate_network(num_users)
+        
+    def generate_network(self, num_users: int):
+        """Generate a realistic social network with small-world properties and diverse separation degrees"""
+        
+        # Create a large grid layout for better spread
+        grid_cols = int(math.sqrt(num_users)) + 2
+        grid_rows = int(math.ceil(num_users / grid_cols))
+        
+        # Calculate spacing with panel width consideration
+        usable_width = self.width - self.panel_width - 200  # Leave margins
+        usable_height = self.height - 200  # Leave top/bottom margins
+        
+        cell_width = usable_width / grid_cols
+        cell_height = usable_height / grid_rows
+        
+        # Draw every per-user random value up front, in the same order for both
+        # backends, so that a given seed always produces the same graph
+        jitter_x, jitter_y, name_index, radii = [], [], [], []
+        for user_id in range(num_users):
+            # Randomization within cell for natural look
+            jitter_x.append(self.rng.uniform(-cell_width * 0.3, cell_width * 0.3))
+            jitter_y.append(self.rng.uniform(-cell_height * 0.3, cell_height * 0.3))
+            
+            # Get Indian name; past the end of the list a random base name
+            # gets a numeric suffix (see NodeStore.name_of)
+            if user_id < len(INDIAN_NAMES):
+                name_index.append(user_id)
+            else:
+                name_index.append(self.rng.randrange(len(INDIAN_NAMES)))
+            
+            radii.append(self.rng.randint(8, 12))
+        
+        # Define regions for different connection densities (to create diverse degrees of separation)
+        regions = {
+            'dense': [],      # Highly connected (1-2 degrees)
+            'medium': [],     # Medium connected (2-3 degrees)
+            'sparse': [],     # Lightly connected (3-4 degrees)
+            'isolated': []    # Very few connections (4+ degrees)
+        }
+        
+        if self.backend == "numpy":
+            # Users fill the grid row by row
+            rows, cols = np.divmod(np.arange(num_users), grid_cols)
+            
+            # Calculate base positions in grid, add the jitter and ensure bounds
+            base_x = 100 + cols * cell_width + cell_width / 2
+            base_y = 100 + rows * cell_height + cell_height / 2
+            xs = np.maximum(80, np.minimum(usable_width + 80, base_x + np.array(jitter_x)))
+            ys = np.maximum(80, np.minimum(self.height - 80, base_y + np.array(jitter_y)))
+            
+            # Assign users to regions based on position for diverse connectivity
+            dense = (rows < grid_rows * 0.3) & (cols < grid_cols * 0.3)
+            medium = ~dense & (rows < grid_rows * 0.6) & (cols < grid_cols * 0.6)
+            sparse = ~dense & ~medium & (rows < grid_rows * 0.8) & (cols < grid_cols * 0.8)
+            region_of = np.select([dense, medium, sparse], [0, 1, 2], default=3)
+            for index, region in enumerate(regions):
+                regions[region] = np.flatnonzero(region_of == index).tolist()
+        else:
+            xs, ys = [], []
+            for user_id in range(num_users):
+                row, col = divmod(user_id, grid_cols)
+                
+                # Calculate base position in grid
+                base_x = 100 + col * cell_width + cell_width / 2
+                base_y = 100 + row * cell_height + cell_height / 2
+                
+                # Ensure bounds
+                xs.append(max(80, min(usable_width + 80, base_x + jitter_x[user_id])))
+                ys.append(max(80, min(self.height - 80, base_y + jitter_y[user_id])))
+                
+                # Assign users to regions based on position for diverse connectivity
+                if row < grid_rows * 0.3 and col < grid_cols * 0.3:
+                    regions['dense'].append(user_id)
+                elif row < grid_rows * 0.6 and col < grid_cols * 0.6:
+                    regions['medium'].append(user_id)
+                elif row < grid_rows * 0.8 and col < grid_cols * 0.8:
+                    regions['sparse'].append(user_id)
+                else:
+                    regions['isolated'].append(user_id)
+        
+        self.users.extend(name_index, xs, ys, radii)
+        
+        # Create connections based on regions to ensure diverse degrees of separation
+        self._pending_edges = EdgeList()
+        self.create_diverse_connections(regions)
+        edges, self._pending_edges = self._pending_edges, None
+        self.connections = CSRAdjacency.from_edges(num_users, edges.sources, edges.targets)
+        self.stats = NetworkStats(self.connections)
+        self._separation_histogram = None
+        # New positions and edges: cached grids and layers are stale
+        self.version += 1
+    
+    def rescale_layout(self, width: int, height: int):
+        """Fit the existing layout to a new canvas size without regenerating.
+        
+        Positions are stretched from the old usable area (inside the margins
+        and left of the panel) to the new one in a single pass. Edges,
+        selection, paths and every id-keyed cache stay valid, and so do the
+        spatial grids: they keep their build-time positions and queries are
+        mapped back through the accumulated stretch.
+        """
+        if (width, height) == (self.width, self.height):
+            return
+        scale_x = max(1, width - self.panel_width - 200) / max(1, self.width - self.panel_width - 200)
+        scale_y = max(1, height - 200) / max(1, self.height - 200)
+        self.users.scale_positions(scale_x, scale_y, 100, 100)
+        self.width, self.height = width, height
+        
+        grids_current = self._grid_version == self.version
+        self.version += 1
+        if grids_current:
+            grid_scale_x, grid_scale_y = self._grid_scale
+            self._grid_scale = (grid_scale_x * scale_x, grid_scale_y * scale_y)
+            self._grid_version = self.version
+    
+    def create_diverse_connections(self, regions: Dict[str, List[int]]):
+        """Create connections to ensure diverse degrees of separation (1-4)"""
+        # How many nearby users each user connects to, plus the random long-range
+        # links. None of these draws depend on the edges added so far, so they are
+        # made first and both backends then wire up the same plan.
+        num_nearby: Dict[int, int] = {}
+        random_links: List[Tuple[int, int]] = []
+        
+        # Dense region: High connectivity (1-2 degrees of separation)
+        for user_id in regions['dense']:
+            # High connectivity: 8-15 connections
+            num_nearby[user_id] = self.rng.randint(8, 15)
+            
+            # Add random long-range connections within dense region
+            for _ in range(self.rng.randint(3, 6)):
+                random_user = self.rng.choice(regions['dense'])
+                if random_user != user_id:
+                    random_links.append((user_id, random_user))
+        
+        # Medium region: Medium connectivity (2-3 degrees of separation)
+        for user_id in regions['medium']:
+            # Medium connectivity: 5-10 connections
+            num_nearby[user_id] = self.rng.randint(5, 10)
+            
+            # Some connections to dense region
+            if self.rng.random() < 0.6 and regions['dense']:
+                random_links.append((user_id, self.rng.choice(regions['dense'])))
+        
+        # Sparse region: Low connectivity (3-4 degrees of separation)
+        for user_id in regions['sparse']:
+            # Low connectivity: 3-6 connections
+            num_nearby[user_id] = self.rng.randint(3, 6)
+            
+            # Occasional bridge to medium region
+            if self.rng.random() < 0.4 and regions['medium']:
+                random_links.append((user_id, self.rng.choice(regions['medium'])))
+        
+        # Isolated region: Very low connectivity (4+ degrees of separation)
+        for user_id in regions['isolated']:
+            # Very low connectivity: 1-4 connections
+            num_nearby[user_id] = self.rng.randint(1, 4)
+            
+            # Rare bridge to sparse region
+            if self.rng.random() < 0.3 and regions['sparse']:
+                random_links.append((user_id, self.rng.choice(regions['sparse'])))
+        
+        # Connect every user to its nearest neighbours
+        if self.backend == "numpy":
+            user_ids = np.fromiter(num_nearby.keys(), dtype=np.int64, count=len(num_nearby))
+            counts = np.fromiter(num_nearby.values(), dtype=np.int64, count=len(num_nearby))
+            neighbors = nearest_neighbors_batch(self.users.xs, self.users.ys, user_ids, counts)
+            found = neighbors >= 0
+            sources = np.broadcast_to(user_ids[:, None], neighbors.shape)[found]
+            self.add_connections(sources, neighbors[found])
+        else:
+            # Nearest-neighbour lookups go through a uniform grid instead of
+            # sorting the distance to every other user
+            xs, ys = self.users.xs, self.users.ys
+            index = GridIndex(zip(range(len(xs)), xs, ys))
+            for user_id, count in num_nearby.items():
+                for neighbor_id in index.nearest(xs[user_id], ys[user_id], count, exclude=user_id):
+                    self.add_connection(user_id, neighbor_id)
+        
+        self.add_connections([user_id for user_id, _ in random_links],
+                             [other_id for _, other_id in random_links])
+        
+        # Add some cross-region bridges to ensure connectivity
+        self.add_cross_region_bridges(regions)
+    
+    def add_cross_region_bridges(self, regions: Dict[str, List[int]]):
+        """Add strategic bridges between regions to ensure network connectivity"""
+        region_pairs = [
+            ('dense', 'medium', 0.7),    # 70% chance
+            ('medium', 'sparse', 0.5),   # 50% chance  
+            ('sparse', 'isolated', 0.3), # 30% chance
+            ('dense', 'sparse', 0.2),    # 20% chance (long bridge)
+            ('medium', 'isolated', 0.1)  # 10% chance (very long bridge)
+        ]
+        
+        for region1, region2, probability in region_pairs:
+            if regions[region1] and regions[region2]:
+                # Add multiple bridges based on region sizes
+                num_bridges = max(1, min(len(regions[region1]), len(regions[region2])) // 10)
+                
+                for _ in range(num_bridges):
+                    if self.rng.random() < probability:
+                        user1 = self.rng.choice(regions[region1])
+                        user2 = self.rng.choice(regions[region2])
+                        self.add_connection(user1, user2)
+    
+    def add_connection(self, user1_id: int, user2_id: int):
+        """Add bidirectional connection between two users"""
+        if self._pending_edges is not None:
+            # Still generating; duplicates are dropped when the CSR arrays are packed
+            self._pending_edges.add(user1_id, user2_id)
+        elif self.connections.add_edge(user1_id, user2_id):
+            self.stats.add_edge(user1_id, user2_id, self.connections.degree(user1_id),
+                                self.connections.degree(user2_id))
+            # Precomputed distances and cached paths no longer hold
+            self.distance_index = None
+            self.path_cache.clear()
+            self.search_tree = None
+            self.version += 1
+    
+    def add_connections(self, user1_ids: Iterable[int], user2_ids: Iterable[int]):
+        """Add many bidirectional connections at once"""
+        if self._pending_edges is not None:
+            self._pending_edges.extend(user1_ids, user2_ids)
+        else:
+            for user1_id, user2_id in zip(user1_ids, user2_ids):
+                self.add_connection(user1_id, user2_id)
+    
+    def bfs_levels(self, start_id: int, target_id: int) -> Generator[Sequence[int], None, List[int]]:
+        """BFS from start_id that yields each level as soon as it is explored.
+        
+        The last level yielded ends at the target. The path (empty if the
+        target is unreachable) is the generator's return value. Only the
+        parent pointers and the live frontier are held, and closing the
+        generator abandons the search.
+        """
+        if start_id == target_id:
+            yield array('i', [start_id])
+            return [start_id]
+        
+        offsets = self.connections.offsets
+        neighbors = self.connections.neighbors
+        
+        # Every discovered node remembers the node it was reached from, so no
+        # path lists are copied; the path is rebuilt once the target is found
+        parents = {start_id: start_id}
+        frontier = array('i', [start_id])
+        
+        # Start node is the first step
+        yield frontier
+        
+        while frontier:
+            current_level_nodes = array('i')
+            
+            # Process all nodes at current level
+            for current_id in frontier:
+                # Explore all neighbors of current node
+                for neighbor_id in neighbors[offsets[current_id]:offsets[current_id + 1]]:
+                    if neighbor_id not in parents:
+                        parents[neighbor_id] = current_id
+                        current_level_nodes.append(neighbor_id)
+                        
+                        if neighbor_id == target_id:
+                            # Target found! Yield this level and stop
+                            yield current_level_nodes
+                            return self.build_path(parents, target_id)
+            
+            # Yield the level if we explored any nodes
+            if current_level_nodes:
+                yield current_level_nodes
+            
+            frontier = current_level_nodes
+        
+        return []  # No path found
+    
+    def bfs_shortest_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """Find shortest path using BFS and return path + animation steps with detailed exploration"""
+        return self.collect_levels(self.bfs_levels(start_id, target_id))
+    
+    @staticmethod
+    def collect_levels(search: Generator[Sequence[int], None, List[int]]) -> Tuple[List[int], List[Sequence[int]]]:
+        """Run a level generator to the end, returning (path, every level)"""
+        levels = []
+        while True:
+            try:
+                levels.append(next(search))
+            except StopIteration as done:
+                return done.value, levels
+    
+    @staticmethod
+    def build_path(parents: Dict[int, int], target_id: int) -> List[int]:
+        """Walk parent pointers back from target to the search root"""
+        path = [target_id]
+        while parents[path[-1]] != path[-1]:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+    
+    def bidirectional_levels(self, start_id: int, target_id: int) -> Generator[Sequence[int], None, List[int]]:
+        """Grow BFS waves from both users until they meet, yielding each round.
+        
+        Each round expands whichever frontier is smaller and yields its newly
+        reached nodes, so both waves can be shown. Returns the path like
+        bfs_levels.
+        """
+        if start_id == target_id:
+            yield array('i', [start_id])
+            return [start_id]
+        
+        offsets = self.connections.offsets
+        neighbors = self.connections.neighbors
+        
+        forward_parents = {start_id: start_id}
+        backward_parents = {target_id: target_id}
+        forward = array('i', [start_id])
+        backward = array('i', [target_id])
+        
+        # Both endpoints make up the first step
+        yield array('i', [start_id, target_id])
+        
+        while forward and backward:
+            # Expand the smaller frontier to keep the explored set small
+            expand_forward = len(forward) <= len(backward)
+            if expand_forward:
+                frontier, parents, other_parents = forward, forward_parents, backward_parents
+            else:
+                frontier, parents, other_parents = backward, backward_parents, forward_parents
+            
+            current_level_nodes = array('i')
+            for current_id in frontier:
+                for neighbor_id in neighbors[offsets[current_id]:offsets[current_id + 1]]:
+                    if neighbor_id not in parents:
+                        parents[neighbor_id] = current_id
+                        current_level_nodes.append(neighbor_id)
+                        
+                        if neighbor_id in other_parents:
+                            # The waves met. The visited sets never overlapped
+                            # before this round, so this is a shortest path.
+                            yield current_level_nodes
+                            path = self.build_path(forward_parents, neighbor_id)
+                            path.extend(reversed(self.build_path(backward_parents, neighbor_id)[:-1]))
+                            return path
+            
+            if current_level_nodes:
+                yield current_level_nodes
+            
+            if expand_forward:
+                forward = current_level_nodes
+            else:
+                backward = current_level_nodes
+        
+        return []  # No path found
+    
+    def bidirectional_bfs_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """Find shortest path by growing BFS waves from both users until they meet"""
+        return self.collect_levels(self.bidirectional_levels(start_id, target_id))
+    
+    def build_search_tree(self, start_id: int) -> SearchTree:
+        """Run BFS from start_id over the whole graph, keeping parents and levels"""
+        offsets = self.connections.offsets
+        neighbors = self.connections.neighbors
+        num_users = len(self.connections)
+        
+        parents = array('i', [-1]) * num_users
+        ranks = array('i', [-1]) * num_users
+        parents[start_id] = start_id
+        ranks[start_id] = 0
+        order = array('i', [start_id])
+        level_starts = [0]
+        
+        level_start = 0
+        while level_start < len(order):
+            level_end = len(order)
+            level_starts.append(level_end)
+            for current_id in order[level_start:level_end]:
+                for neighbor_id in neighbors[offsets[current_id]:offsets[current_id + 1]]:
+                    if parents[neighbor_id] == -1:
+                        parents[neighbor_id] = current_id
+                        ranks[neighbor_id] = len(order)
+                        order.append(neighbor_id)
+            level_start = level_end
+        
+        return SearchTree(start_id, parents, ranks, order, level_starts)
+    
+    def tree_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """Answer from the BFS tree of start_id, building it on first use.
+        
+        Gives the same path and animation steps as bfs_shortest_path: the
+        levels before the target's plus its own level up to the target.
+        """
+        tree = self.search_tree
+        if tree is None or tree.source != start_id:
+            tree = self.search_tree = self.build_search_tree(start_id)
+        
+        order, level_starts = tree.order, tree.level_starts
+        if tree.ranks[target_id] == -1:
+            # Unreachable: a plain BFS would have explored every level
+            return [], [order[level_starts[level]:level_starts[level + 1]]
+                        for level in range(len(level_starts) - 1)]
+        
+        path = [target_id]
+        while tree.parents[path[-1]] != path[-1]:
+            path.append(tree.parents[path[-1]])
+        path.reverse()
+        
+        # The target sits on level len(path) - 1
+        target_level = len(path) - 1
+        animation_steps = [order[level_starts[level]:level_starts[level + 1]]
+                           for level in range(target_level)]
+        animation_steps.append(order[level_starts[target_level]:tree.ranks[target_id] + 1])
+        return path, animation_steps
+    
+    def tree_levels(self, start_id: int, target_id: int) -> Generator[Sequence[int], None, List[int]]:
+        """tree_path as a level generator (the tree itself is built in one go)"""
+        path, animation_steps = self.tree_path(start_id, target_id)
+        yield from animation_steps
+        return path
+    
+    def frontier_levels(self, start_id: int, target_id: int) -> Generator[Sequence[int], None, List[int]]:
+        """Direction-optimizing BFS (see frontier_bfs) as a level generator.
+        
+        Levels are sorted by id and the last one stops at the target in id
+        order, so it can hold different users than bfs_levels' last level.
+        The path is a shortest path but may differ from bfs_levels' when
+        there are ties.
+        """
+        return frontier_bfs_levels(self.connections, start_id, target_id, self.backend)
+    
+    def frontier_bfs_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """Find shortest path with the direction-optimizing BFS"""
+        return self.collect_levels(self.frontier_levels(start_id, target_id))
+    
+    def search_levels(self, start_id: int, target_id: int) -> Generator[Sequence[int], None, List[int]]:
+        """Level generator for the search selected by search_mode"""
+        if self.search_mode == "bidirectional":
+            return self.bidirectional_levels(start_id, target_id)
+        if self.search_mode == "tree":
+            return self.tree_levels(start_id, target_id)
+        if self.search_mode == "frontier":
+            return self.frontier_levels(start_id, target_id)
+        return self.bfs_levels(start_id, target_id)
+    
+    def find_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """Run the search selected by search_mode"""
+        if self.search_mode == "tree":
+            return self.tree_path(start_id, target_id)
+        return self.collect_levels(self.search_levels(start_id, target_id))
+    
+    @property
+    def current_path(self) -> List[int]:
+        return self._current_path
+    
+    @current_path.setter
+    def current_path(self, path: List[int]):
+        """Set the path and the lookups derived from it.
+        
+        path_index maps each user on the path to its position, and
+        path_edges holds each path connection once as (lower id, higher id).
+        Replace the path rather than editing the list in place, or these
+        go stale.
+        """
+        self._current_path = path
+        self.path_index: Dict[int, int] = {user_id: index for index, user_id in enumerate(path)}
+        self.path_edges = frozenset((min(user_id, next_id), max(user_id, next_id))
+                                    for user_id, next_id in zip(path, path[1:]))
+    
+    def lookup_path(self, start_id: int, target_id: int) -> Optional[Tuple[List[int], List[Sequence[int]]]]:
+        """Cached (path, animation steps) for the current search mode, or None.
+        
+        Animation steps are shared with the cache and must not be modified.
+        """
+        key = (start_id, target_id, self.search_mode)
+        cached = self.path_cache.get(key)
+        if cached is not None:
+            self.path_cache_hits += 1
+            self.path_cache.move_to_end(key)
+        return cached
+    
+    def reverse_path(self, start_id: int, target_id: int) -> Optional[List[int]]:
+        """Path from a cached (target, start) result, reversed, or None.
+        
+        Only the path carries over: the cached levels grew from the other
+        user, so they are no use for animating a search from start_id.
+        """
+        reverse = self.path_cache.get((target_id, start_id, self.search_mode))
+        return reverse[0][::-1] if reverse is not None else None
+    
+    def remember_path(self, start_id: int, target_id: int, result: Tuple[List[int], List[Sequence[int]]]):
+        """Add a search result to the LRU cache, evicting the oldest entries"""
+        self.path_cache[(start_id, target_id, self.search_mode)] = result
+        while len(self.path_cache) > self.path_cache_size:
+            self.path_cache.popitem(last=False)
+    
+    def cached_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[Sequence[int]]]:
+        """find_path with an LRU cache in front of it (see lookup_path)"""
+        cached = self.lookup_path(start_id, target_id)
+        if cached is None:
+            self.path_cache_misses += 1
+            cached = self.find_path(start_id, target_id)
+            self.remember_path(start_id, target_id, cached)
+        
+        path, animation_steps = cached
+        return list(path), animation_steps
+    
+    def build_distance_index(self, **options) -> DistanceOracle:
+        """Precompute hop distances (all-pairs or landmarks) for repeated queries.
+        
+        The index stays valid until the graph changes; add_connection drops it.
+        Options are passed on to DistanceOracle.
+        """
+        self.distance_index = DistanceOracle(self.connections, **options)
+        return self.distance_index
+    
+    def separation(self, start_id: int, target_id: int) -> int:
+        """Degrees of separation between two users, -1 if they are not connected"""
+        if self.distance_index is not None:
+            distance = self.distance_index.distance(start_id, target_id)
+            if distance is not None:
+                return distance
+        path, _ = self.bidirectional_bfs_path(start_id, target_id)
+        return len(path) - 1 if path else -1
+    
+    def separation_histogram(self, max_exact_users: int = 1000,
+                             num_sources: int = 32) -> Tuple[List[int], int]:
+        """Pairs of users by degrees of separation, as (histogram, unreachable).
+        
+        Exact for networks up to max_exact_users; larger networks are
+        estimated from num_sources random users. Cached until the graph changes.
+        """
+        # Edges are only ever added, so the edge count identifies the graph;
+        # unlike version it survives a rescale, which leaves distances alone
+        num_edges = self.stats.num_edges
+        cached = self._separation_histogram
+        if cached is None or cached[0] != num_edges:
+            sources = None if len(self.users) <= max_exact_users else num_sources
+            histogram, unreachable = separation_histogram(self.connections, sources,
+                                                          random.Random(num_edges))
+            cached = self._separation_histogram = (num_edges, histogram, unreachable)
+        return cached[1], cached[2]
+    
+    def start_bfs_animation(self):
+        """Start BFS animation between selected users"""
+        if self.selected_user is not None and self.target_user is not None:
+            # Reset animation state
+            self.bfs_visited_nodes.clear()
+            self.current_exploring_nodes.clear()
+            self.clear_vanishing()
+            self.is_animating_bfs = True
+            self.bfs_complete = False
+            self.show_final_path_time = 0
+            
+            self.cancel_search()
+            self.search_error = None
+            self.bfs_animation = []
+            self.animation_step = 0
+            self.last_animation_time = time.time()
+            
+            cached = self.lookup_path(self.selected_user, self.target_user)
+            if cached is not None:
+                path, animation_steps = cached
+                self._search = iter(animation_steps)
+                self.animation_levels = len(animation_steps)
+                self.set_search_result(path, sum(len(level) for level in animation_steps))
+            else:
+                # Search lazily, one level per animation step, so the first
+                # frame shows at once even on huge graphs
+                self.path_cache_misses += 1
+                self._search = self.search_levels(self.selected_user, self.target_user)
+                if self.search_runner is not None:
+                    self._search = self.search_runner(self._search)
+                # Keyed on the edge count, not version, so a rescale mid-search still caches
+                self._search_key = (self.selected_user, self.target_user, self.search_mode,
+                                    self.stats.num_edges)
+                self.search_pending = True
+                self.animation_levels = None
+                self.current_path = []
+                self.path_found = False
+                self.nodes_explored = 0
+                # With a distance index or a cached search the other way
+                # round, the separation is known before the search ends
+                self.degrees_of_separation = None
+                reverse = self.reverse_path(self.selected_user, self.target_user)
+                if reverse is not None:
+                    self.degrees_of_separation = len(reverse) - 1 if reverse else -1
+                elif self.distance_index is not None:
+                    self.degrees_of_separation = self.distance_index.distance(self.selected_user, self.target_user)
+            self._next_level = self.pull_level()
+    
+    def set_search_result(self, path: List[int], nodes_explored: int):
+        """Publish a finished search: path, separation (-1 if none) and work done"""
+        self.current_path = list(path)
+        self.path_found = len(path) > 0
+        self.degrees_of_separation = len(path) - 1 if self.path_found else -1
+        self.nodes_explored = nodes_explored
+    
+    def pull_level(self) -> Optional[Sequence[int]]:
+        """Next level from the running search or replay, None once it is done.
+        
+        When a live search finishes its result is published and cached,
+        unless the graph changed while it ran. A search that raises ends as
+        a failed search with no path, and search_error says why.
+        """
+        try:
+            level = next(self._search)
+        except StopIteration as done:
+            self._search = None
+            if self.search_pending:
+                self.search_pending = False
+                self.animation_levels = len(self.bfs_animation)
+                start_id, target_id, search_mode, num_edges = self._search_key
+                if num_edges == self.stats.num_edges and search_mode == self.search_mode:
+                    self.remember_path(start_id, target_id, (done.value, list(self.bfs_animation)))
+                self.set_search_result(done.value, self.nodes_explored)
+            return None
+        except Exception as error:
+            if not self.search_pending:
+                raise
+            # Not cached, so selecting the pair again retries the search
+            self._search = None
+            self.search_pending = False
+            self.animation_levels = len(self.bfs_animation)
+            self.search_error = f"{type(error).__name__}: {error}"
+            self.set_search_result([], self.nodes_explored)
+            return None
+        if self.search_pending and level is not LEVEL_PENDING:
+            self.nodes_explored += len(level)
+        return level
+    
+    @property
+    def waiting_for_search(self) -> bool:
+        """Playback is stalled on a level that is still being computed"""
+        return self.is_animating_bfs and self._next_level is LEVEL_PENDING
+    
+    def cancel_search(self):
+        """Stop a running search or replay; an unfinished search is not cached"""
+        if self.search_pending:
+            self._search.close()
+        self._search = None
+        self._next_level = None
+        self.search_pending = False
+    
+    def schedule_vanishing(self, vanish_start_time: float):
+        """Fade out every visited node off the path, staggered by distance from the start user"""
+        node_ids = array('i', self.bfs_visited_nodes.difference(self.path_index))
+        distances = self.users.distances_from(self.selected_user, node_ids)
+        # Max 0.5s stagger
+        starts = array('d', [vanish_start_time + (distance / 1000) * 0.5 for distance in distances])
+        self._vanish_ids, self._vanish_starts = node_ids, starts
+        self.vanishing_nodes = dict(zip(node_ids, starts))
+        # Every node vanishes for the same duration, so start order is end order
+        self._vanish_heap = list(zip(starts, node_ids))
+        heapq.heapify(self._vanish_heap)
+        self.vanish_scheduled = frozenset(self.vanishing_nodes)
+    
+    def clear_vanishing(self):
+        """Drop any vanish animation, drawing its nodes fully again"""
+        self.users.reset_alphas(self._vanish_ids)
+        self.vanishing_nodes.clear()
+        self.vanish_scheduled = frozenset()
+        self._vanish_ids = array('i')
+        self._vanish_starts = array('d')
+        self._vanish_heap = []
+    
+    def update_animation(self, current_time: float):
+        """Update BFS animation with enhanced visualization"""
+        # Pulse phases for everyone, in one batched step
+        if self._last_frame_time is not None:
+            self.users.advance_pulses(current_time - self._last_frame_time)
+        self._last_frame_time = current_time
+        
+        if not self.is_animating_bfs:
+            return
+            
+        search_ended = False
+        if self._next_level is LEVEL_PENDING:
+            # Keep polling a search that runs elsewhere
+            self._next_level = self.pull_level()
+            search_ended = self._next_level is None
+        
+        # Check if we should advance to next animation step
+        elif (self._next_level is not None and
+              current_time - self.last_animation_time > self.animation_speed):
+            
+            # Add current level nodes to exploring set
+            current_level = self._next_level
+            self.current_exploring_nodes.update(current_level)
+            self.bfs_visited_nodes.update(current_level)
+            self.bfs_animation.append(current_level)
+            
+            self.animation_step += 1
+            self.last_animation_time = current_time
+            
+            # The search runs one level ahead, so this tells if that was the last
+            self._next_level = self.pull_level()
+            search_ended = self._next_level is None
+        
+        # Check if BFS animation is complete
+        if search_ended:
+            self.bfs_complete = True
+            self.show_final_path_time = current_time
+            
+            if self.path_found:
+                # Start vanishing animation after delay
+                self.schedule_vanishing(current_time + self.vanish_delay)
+        
+        # Update vanishing animation
+        if self.vanishing_nodes:
+            self.users.update_alphas(self._vanish_ids, self._vanish_starts, current_time, self.vanish_duration)
+            
+            # Nodes that finished vanishing come off the heap, earliest first
+            heap = self._vanish_heap
+            finished = []
+            while heap and heap[0][0] + self.vanish_duration <= current_time:
+                _, node_id = heapq.heappop(heap)
+                finished.append(node_id)
+                del self.vanishing_nodes[node_id]
+                self.bfs_visited_nodes.discard(node_id)
+                self.current_exploring_nodes.discard(node_id)
+            self.users.reset_alphas(finished)
+            
+            # Check if all nodes have vanished
+            if not self.vanishing_nodes and self.bfs_complete:
+                self.is_animating_bfs = False
+                self.clear_vanishing()
+    
+    def get_user_at_position(self, x: float, y: float, slack: float = 5) -> Optional[int]:
+        """Find the user whose circle (grown by slack) contains the position.
+        
+        Only the grid cells within reach of the largest user are checked; where
+        circles overlap the user with the nearest centre wins.
+        """
+        self.build_grids()
+        reach = self._max_radius + slack
+        xs, ys, radii = self.users.xs, self.users.ys, self.users.radii
+        best_id, best_distance = None, 0.0
+        for user_id in self._user_grid.query_rect(*self._grid_rect(x - reach, y - reach, x + reach, y + reach)):
+            distance = math.sqrt((xs[user_id] - x) ** 2 + (ys[user_id] - y) ** 2)
+            if distance > radii[user_id] + slack:
+                continue
+            if best_id is None or (distance, user_id) < (best_distance, best_id):
+                best_id, best_distance = user_id, distance
+        return best_id
+    
+    def build_grids(self):
+        """(Re)build the user and edge grids if the graph changed since the last build"""
+        if self._grid_version == self.version:
+            return
+        xs, ys = self.users.xs, self.users.ys
+        self._user_grid = GridIndex(zip(range(len(xs)), xs, ys))
+        self._max_radius = max(self.users.radii, default=0)
+        
+        sources, targets = array('i'), array('i')
+        for user_id, connected_id in self.connections.edges():
+            sources.append(user_id)
+            targets.append(connected_id)
+        self._edge_ends = (sources, targets)
+        self._edge_grid = SegmentIndex(
+            ((edge_id, xs[source], ys[source], xs[target], ys[target])
+             for edge_id, (source, target) in enumerate(zip(sources, targets))),
+            cell_size=self._user_grid.cell_size * 2)
+        self._grid_version = self.version
+        self._grid_scale = (1.0, 1.0)
+    
+    def _grid_rect(self, x0: float, y0: float, x1: float, y1: float) -> Tuple[float, float, float, float]:
+        """A rectangle in current positions, mapped to the positions the grids were built with.
+        
+        Rescales stretch about (100, 100) by positive factors, so rectangles
+        stay rectangles and what lies inside stays inside.
+        """
+        scale_x, scale_y = self._grid_scale
+        return (100 + (x0 - 100) / scale_x, 100 + (y0 - 100) / scale_y,
+                100 + (x1 - 100) / scale_x, 100 + (y1 - 100) / scale_y)
+    
+    def users_in_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Ids of users whose centre lies inside the rectangle"""
+        self.build_grids()
+        return self._user_grid.query_rect(*self._grid_rect(x0, y0, x1, y1))
+    
+    def edges_in_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[Tuple[int, int]]:
+        """Connections (lower id, higher id) whose bounding box overlaps the rectangle"""
+        self.build_grids()
+        sources, targets = self._edge_ends
+        return [(sources[edge_id], targets[edge_id])
+                for edge_id in self._edge_grid.query_rect(*self._grid_rect(x0, y0, x1, y1))]
+    
+    def _clear_selection_flags(self):
+        """Clear the flags of the current start/target users (the only ones set)"""
+        for user_id in (self.selected_user, self.target_user):
+            if user_id is not None:
+                self.users.clear_flags(user_id)
+    
+    def select_user(self, user_id: int):
+        """Select a user as start point"""
+        # Reset previous selections
+        self._clear_selection_flags()
+        
+        self.selected_user = user_id
+        self.search_tree = None
+        self.users[user_id].is_selected = True
+        self.target_user = None
+        self.cancel_search()
+        self.search_error = None
+        self.current_path = []
+        self.bfs_animation = []
+        self.animation_step = 0
+        self.path_found = False
+    
+    def select_target(self, user_id: int):
+        """Select a user as target point"""
+        if self.selected_user is not None and user_id != self.selected_user:
+            # Reset previous target
+            if self.target_user is not None:
+                self.users[self.target_user].is_target = False
+            
+            self.target_user = user_id
+            self.users[user_id].is_target = True
+            self.start_bfs_animation()
+    
+    def reset_selection(self):
+        """Reset all selections"""
+        self._clear_selection_flags()
+        self.selected_user = None
+        self.search_tree = None
+        self.target_user = None
+        self.cancel_search()
+        self.search_error = None
+        self.current_path = []
+        self.bfs_animation = []
+        self.animation_step = 0
+        self.path_found = False
+        
+        # Reset BFS visualization state
+        self.bfs_visited_nodes.clear()
+        self.current_exploring_nodes.clear()
+        self.clear_vanishing()
+        self.is_animating_bfs = False
+        self.bfs_complete = False
+        self.show_final_path_time = 0
@@ -1,28 +1,27 @@
 import pygame
 import math
 import random
+import sys
 import time
-from collections import deque, defaultdict
-from dataclasses import dataclass
-from typing import List, Dict, Set, Optional, Tuple
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple
 
-# Initialize Pygame
-pygame.init()
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up drawing very large networks
+    np = None
 
-# Get screen dimensions for fullscreen support
-info = pygame.display.Info()
-SCREEN_WIDTH = info.current_w
-SCREEN_HEIGHT = info.current_h
+from social_network import User, SocialNetwork, USER_COLOR, PANEL_WIDTH, DEFAULT_WIDTH, DEFAULT_HEIGHT, SEARCH_MODES
+from workers import WorkerPool
 
-# Constants - Use fullscreen dimensions
-WIDTH = SCREEN_WIDTH
-HEIGHT = SCREEN_HEIGHT
-WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("Indigram - Indian Social Network Visualization")
+# Display state - set up lazily by init_display() so importing this module
+# (or the headless social_network core) never opens a window
+WIDTH = DEFAULT_WIDTH
+HEIGHT = DEFAULT_HEIGHT
+WIN = None
 
 # Colors - Modern and vibrant Indian-inspired
 BACKGROUND = (8, 10, 20)
-USER_COLOR = (255, 140, 0)  # Saffron
 SELECTED_USER = (255, 50, 50)  # Bright red
 TARGET_USER = (50, 255, 100)  # Green
 CONNECTION_COLOR = (40, 40, 60)
@@ -35,443 +34,66 @@ BUTTON_HOVER = (75, 0, 130)  # Indigo
 EXIT_BUTTON_COLOR = (220, 20, 60)  # Crimson
 EXIT_BUTTON_HOVER = (255, 69, 0)  # Red orange
 
-# Fonts
-FONT_SMALL = pygame.font.Font(None, 16)
-FONT_MEDIUM = pygame.font.Font(None, 20)
-FONT_LARGE = pygame.font.Font(None, 28)
-FONT_TITLE = pygame.font.Font(None, 36)
+# The panel's 4px border line starts 1px left of the panel
+PANEL_BORDER = 1
 
-@dataclass
-class User:
-    id: int
-    name: str
-    x: float
-    y: float
-    connections: Set[int]
-    color: Tuple[int, int, int] = USER_COLOR
-    radius: int = 8
-    is_selected: bool = False
-    is_target: bool = False
-    pulse_phase: float = 0.0
-    
-    def __post_init__(self):
-        self.connections = set()
-        
-    def add_connection(self, user_id: int):
-        self.connections.add(user_id)
+# Networks up to this size fit the window; larger ones get a bigger layout
+BASE_USERS = 300
+
+# Screen-space pan step for the arrow keys
+PAN_KEYS = {
+    pygame.K_LEFT: (100, 0), pygame.K_RIGHT: (-100, 0),
+    pygame.K_UP: (0, 100), pygame.K_DOWN: (0, -100),
+}
+
+# Panel names for SocialNetwork.search_mode
+SEARCH_MODE_LABELS = {"bfs": "BFS", "bidirectional": "Bidirectional BFS", "tree": "BFS tree reuse",
+                      "frontier": "Direction-optimizing BFS"}
+
+# Seconds a failed background job stays reported in the spinner area
+JOB_ERROR_SECONDS = 5
+
+# Fonts - loaded by init_display() once pygame.font is ready
+FONT_SMALL = None
+FONT_MEDIUM = None
+FONT_LARGE = None
+FONT_TITLE = None
+
+def init_display():
+    """Initialize Pygame, open the window at screen size and load fonts"""
+    global WIN, WIDTH, HEIGHT, FONT_SMALL, FONT_MEDIUM, FONT_LARGE, FONT_TITLE
+    if WIN is not None:
+        return WIN
     
-    def distance_to(self, other_x: float, other_y: float) -> float:
-        return math.sqrt((self.x - other_x) ** 2 + (self.y - other_y) ** 2)
+    pygame.init()
     
-    def update_animation(self, dt: float):
-        self.pulse_phase += dt * 3
-        if self.pulse_phase > 2 * math.pi:
-            self.pulse_phase = 0
-
-class SocialNetwork:
-    def __init__(self, num_users: int = 300):
-        self.users: Dict[int, User] = {}
-        self.connections: Dict[int, Set[int]] = defaultdict(set)
-        self.selected_user: Optional[int] = None
-        self.target_user: Optional[int] = None
-        self.current_path: List[int] = []
-        self.bfs_animation: List[List[int]] = []
-        self.animation_step = 0
-        self.animation_speed = 0.3  # Slower for better visibility
-        self.last_animation_time = 0
-        self.path_found = False
-        self.degrees_of_separation = 0
-        
-        # BFS visualization states
-        self.bfs_visited_nodes: Set[int] = set()
-        self.current_exploring_nodes: Set[int] = set()
-        self.is_animating_bfs = False
-        self.bfs_complete = False
-        self.vanishing_nodes: Dict[int, float] = {}  # node_id: vanish_start_time
-        self.vanish_delay = 1.0  # Delay before starting vanish animation
-        self.vanish_duration = 2.0  # Duration of vanish animation
-        self.show_final_path_time = 0
-        
-        self.generate_network(num_users)
-        
-    def generate_network(self, num_users: int):
-        """Generate a realistic social network with small-world properties and diverse separation degrees"""
-        # Extended list of Indian names for more users
-        indian_names = [
-            "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Reyansh", "Muhammad", "Sai", "Krishna", "Atharv",
-            "Ishaan", "Shaurya", "Dhruv", "Aryan", "Yuvraj", "Harsh", "Dev", "Arnav", "Shivansh", "Kartik",
-            "Ananya", "Fatima", "Aadhya", "Diya", "Saanvi", "Myra", "Sara", "Aanya", "Pari", "Kavya",
-            "Priya", "Shreya", "Kiara", "Arya", "Riya", "Tara", "Zara", "Avni", "Ira", "Mahira",
-            "Rohan", "Ayaan", "Karan", "Kabir", "Om", "Ritik", "Tanishq", "Rudra", "Riaan", "Arman",
-            "Nisha", "Meera", "Rahul", "Vikram", "Amit", "Suresh", "Rajesh", "Neha", "Pooja", "Sunita",
-            "Aditi", "Sita", "Geeta", "Maya", "Kiran", "Ravi", "Ajay", "Vijay", "Sanjay", "Deepak",
-            "Kavita", "Mala", "Lata", "Rekha", "Shanti", "Gouri", "Kamala", "Radha", "Lakshmi", "Durga",
-            "Ganesh", "Shiva", "Rama", "Hanuman", "Bharath", "Ashwin", "Varun", "Surya", "Chandra", "Indra",
-            "Anjali", "Divya", "Sonal", "Preeti", "Vandana", "Monika", "Rashmi", "Swati", "Pallavi", "Madhuri",
-            "Akash", "Nikhil", "Tarun", "Manish", "Sachin", "Rohit", "Abhishek", "Vishal", "Sandeep", "Manoj",
-            "Sneha", "Manisha", "Shweta", "Jyoti", "Smita", "Renu", "Deepika", "Karishma", "Sapna", "Nidhi",
-            "Raman", "Prakash", "Mahesh", "Dinesh", "Naresh", "Mukesh", "Ramesh", "Yogesh", "Rajesh", "Sunil",
-            "Sonia", "Meena", "Kiran", "Usha", "Poonam", "Neeta", "Seema", "Geeta", "Rita", "Anita",
-            "Gaurav", "Sourav", "Ashish", "Nitish", "Harish", "Girish", "Jagdish", "Umesh", "Lokesh", "Rakesh",
-            "Kavitha", "Sangita", "Sunitha", "Mamta", "Pushpa", "Sharda", "Leela", "Veena", "Geetha", "Sita"
-        ]
-        
-        # Create a large grid layout for better spread
-        grid_cols = int(math.sqrt(num_users)) + 2
-        grid_rows = int(math.ceil(num_users / grid_cols))
-        
-        # Calculate spacing with panel width consideration
-        panel_width = 450  # Increased panel width
-        usable_width = WIDTH - panel_width - 200  # Leave margins
-        usable_height = HEIGHT - 200  # Leave top/bottom margins
-        
-        cell_width = usable_width / grid_cols
-        cell_height = usable_height / grid_rows
-        
-        # Define regions for different connection densities (to create diverse degrees of separation)
-        regions = {
-            'dense': [],      # Highly connected (1-2 degrees)
-            'medium': [],     # Medium connected (2-3 degrees)
-            'sparse': [],     # Lightly connected (3-4 degrees)
-            'isolated': []    # Very few connections (4+ degrees)
-        }
-        
-        user_id = 0
-        for row in range(grid_rows):
-            for col in range(grid_cols):
-                if user_id >= num_users:
-                    break
-                
-                # Calculate base position in grid
-                base_x = 100 + col * cell_width + cell_width / 2
-                base_y = 100 + row * cell_height + cell_height / 2
-                
-                # Add randomization within cell for natural look
-                x = base_x + random.uniform(-cell_width * 0.3, cell_width * 0.3)
-                y = base_y + random.uniform(-cell_height * 0.3, cell_height * 0.3)
-                
-                # Ensure bounds
-                x = max(80, min(usable_width + 80, x))
-                y = max(80, min(HEIGHT - 80, y))
-                
-                # Get Indian name
-                if user_id < len(indian_names):
-                    name = indian_names[user_id]
-                else:
-                    base_name = random.choice(indian_names)
-                    name = f"{base_name}{user_id - len(indian_names) + 1}"
-                
-                user = User(user_id, name, x, y, set())
-                user.radius = random.randint(8, 12)
-                self.users[user_id] = user
-                
-                # Assign users to regions based on position for diverse connectivity
-                if row < grid_rows * 0.3 and col < grid_cols * 0.3:
-                    regions['dense'].append(user_id)
-                elif row < grid_rows * 0.6 and col < grid_cols * 0.6:
-                    regions['medium'].append(user_id)
-                elif row < grid_rows * 0.8 and col < grid_cols * 0.8:
-                    regions['sparse'].append(user_id)
-                else:
-                    regions['isolated'].append(user_id)
-                
-                user_id += 1
-        
-        # Create connections based on regions to ensure diverse degrees of separation
-        self.create_diverse_connections(regions)
+    # Get screen dimensions for fullscreen support
+    info = pygame.display.Info()
+    WIDTH = info.current_w
+    HEIGHT = info.current_h
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Indigram - Indian Social Network Visualization")
     
-    def create_diverse_connections(self, regions: Dict[str, List[int]]):
-        """Create connections to ensure diverse degrees of separation (1-4)"""
-        
-        # Dense region: High connectivity (1-2 degrees of separation)
-        for user_id in regions['dense']:
-            user = self.users[user_id]
-            # Connect to many nearby users and some random ones
-            distances = []
-            for other_id, other_user in self.users.items():
-                if other_id != user_id:
-                    dist = user.distance_to(other_user.x, other_user.y)
-                    distances.append((dist, other_id))
-            
-            distances.sort()
-            # High connectivity: 8-15 connections
-            num_connections = random.randint(8, 15)
-            for _, neighbor_id in distances[:num_connections]:
-                self.add_connection(user_id, neighbor_id)
-            
-            # Add random long-range connections within dense region
-            for _ in range(random.randint(3, 6)):
-                if regions['dense']:
-                    random_user = random.choice(regions['dense'])
-                    if random_user != user_id and random_user not in user.connections:
-                        self.add_connection(user_id, random_user)
-        
-        # Medium region: Medium connectivity (2-3 degrees of separation)
-        for user_id in regions['medium']:
-            user = self.users[user_id]
-            distances = []
-            for other_id, other_user in self.users.items():
-                if other_id != user_id:
-                    dist = user.distance_to(other_user.x, other_user.y)
-                    distances.append((dist, other_id))
-            
-            distances.sort()
-            # Medium connectivity: 5-10 connections
-            num_connections = random.randint(5, 10)
-            for _, neighbor_id in distances[:num_connections]:
-                self.add_connection(user_id, neighbor_id)
-            
-            # Some connections to dense region
-            if random.random() < 0.6 and regions['dense']:
-                random_dense = random.choice(regions['dense'])
-                if random_dense not in user.connections:
-                    self.add_connection(user_id, random_dense)
-        
-        # Sparse region: Low connectivity (3-4 degrees of separation)
-        for user_id in regions['sparse']:
-            user = self.users[user_id]
-            distances = []
-            for other_id, other_user in self.users.items():
-                if other_id != user_id:
-                    dist = user.distance_to(other_user.x, other_user.y)
-                    distances.append((dist, other_id))
-            
-            distances.sort()
-            # Low connectivity: 3-6 connections
-            num_connections = random.randint(3, 6)
-            for _, neighbor_id in distances[:num_connections]:
-                self.add_connection(user_id, neighbor_id)
-            
-            # Occasional bridge to medium region
-            if random.random() < 0.4 and regions['medium']:
-                random_medium = random.choice(regions['medium'])
-                if random_medium not in user.connections:
-                    self.add_connection(user_id, random_medium)
-        
-        # Isolated region: Very low connectivity (4+ degrees of separation)
-        for user_id in regions['isolated']:
-            user = self.users[user_id]
-            distances = []
-            for other_id, other_user in self.users.items():
-                if other_id != user_id:
-                    dist = user.distance_to(other_user.x, other_user.y)
-                    distances.append((dist, other_id))
-            
-            distances.sort()
-            # Very low connectivity: 1-4 connections
-            num_connections = random.randint(1, 4)
-            for _, neighbor_id in distances[:num_connections]:
-                self.add_connection(user_id, neighbor_id)
-            
-            # Rare bridge to sparse region
-            if random.random() < 0.3 and regions['sparse']:
-                random_sparse = random.choice(regions['sparse'])
-                if random_sparse not in user.connections:
-                    self.add_connection(user_id, random_sparse)
-        
-        # Add some cross-region bridges to ensure connectivity
-        self.add_cross_region_bridges(regions)
-    
-    def add_cross_region_bridges(self, regions: Dict[str, List[int]]):
-        """Add strategic bridges between regions to ensure network connectivity"""
-        region_pairs = [
-            ('dense', 'medium', 0.7),    # 70% chance
-            ('medium', 'sparse', 0.5),   # 50% chance  
-            ('sparse', 'isolated', 0.3), # 30% chance
-            ('dense', 'sparse', 0.2),    # 20% chance (long bridge)
-            ('medium', 'isolated', 0.1)  # 10% chance (very long bridge)
-        ]
-        
-        for region1, region2, probability in region_pairs:
-            if regions[region1] and regions[region2]:
-                # Add multiple bridges based on region sizes
-                num_bridges = max(1, min(len(regions[region1]), len(regions[region2])) // 10)
-                
-                for _ in range(num_bridges):
-                    if random.random() < probability:
-                        user1 = random.choice(regions[region1])
-                        user2 = random.choice(regions[region2])
-                        if user2 not in self.users[user1].connections:
-                            self.add_connection(user1, user2)
-    
-    def add_connection(self, user1_id: int, user2_id: int):
-        """Add bidirectional connection between two users"""
-        self.users[user1_id].add_connection(user2_id)
-        self.users[user2_id].add_connection(user1_id)
-        self.connections[user1_id].add(user2_id)
-        self.connections[user2_id].add(user1_id)
-    
-    def bfs_shortest_path(self, start_id: int, target_id: int) -> Tuple[List[int], List[List[int]]]:
-        """Find shortest path using BFS and return path + animation steps with detailed exploration"""
-        if start_id == target_id:
-            return [start_id], [[start_id]]
-        
-        queue = deque([(start_id, [start_id])])
-        visited = {start_id}
-        animation_steps = []
-        
-        # Add start node as first step
-        animation_steps.append([start_id])
-        
-        while queue:
-            current_level_nodes = []
-            next_queue = deque()
-            
-            # Process all nodes at current level
-            while queue:
-                current_id, path = queue.popleft()
-                
-                # Explore all neighbors of current node
-                for neighbor_id in self.users[current_id].connections:
-                    if neighbor_id not in visited:
-                        new_path = path + [neighbor_id]
-                        current_level_nodes.append(neighbor_id)
-                        visited.add(neighbor_id)
-                        
-                        if neighbor_id == target_id:
-                            # Target found! Add this level and return
-                            animation_steps.append(current_level_nodes)
-                            return new_path, animation_steps
-                        
-                        next_queue.append((neighbor_id, new_path))
-            
-            # Add current level to animation if we explored any nodes
-            if current_level_nodes:
-                animation_steps.append(current_level_nodes[:])
-            
-            queue = next_queue
-        
-        return [], animation_steps  # No path found
-    
-    def start_bfs_animation(self):
-        """Start BFS animation between selected users"""
-        if self.selected_user is not None and self.target_user is not None:
-            # Reset animation state
-            self.bfs_visited_nodes.clear()
-            self.current_exploring_nodes.clear()
-            self.vanishing_nodes.clear()
-            self.is_animating_bfs = True
-            self.bfs_complete = False
-            self.show_final_path_time = 0
-            
-            self.current_path, self.bfs_animation = self.bfs_shortest_path(
-                self.selected_user, self.target_user
-            )
-            self.animation_step = 0
-            self.last_animation_time = time.time()
-            self.path_found = len(self.current_path) > 0
-            self.degrees_of_separation = len(self.current_path) - 1 if self.path_found else -1
-    
-    def update_animation(self, current_time: float):
-        """Update BFS animation with enhanced visualization"""
-        if not self.is_animating_bfs or not self.bfs_animation:
-            return
-            
-        # Check if we should advance to next animation step
-        if (self.animation_step < len(self.bfs_animation) and
-            current_time - self.last_animation_time > self.animation_speed):
-            
-            # Add current level nodes to exploring set
-            current_level = self.bfs_animation[self.animation_step]
-            for node_id in current_level:
-                self.current_exploring_nodes.add(node_id)
-                self.bfs_visited_nodes.add(node_id)
-            
-            self.animation_step += 1
-            self.last_animation_time = current_time
-            
-            # Check if BFS animation is complete
-            if self.animation_step >= len(self.bfs_animation):
-                self.bfs_complete = True
-                self.show_final_path_time = current_time
-                
-                if self.path_found:
-                    # Start vanishing animation after delay
-                    vanish_start_time = current_time + self.vanish_delay
-                    
-                    # Schedule vanishing for all visited nodes except the path
-                    for node_id in self.bfs_visited_nodes:
-                        if node_id not in self.current_path:
-                            # Add staggered delay based on distance from start
-                            start_node = self.users[self.selected_user]
-                            node = self.users[node_id]
-                            distance = start_node.distance_to(node.x, node.y)
-                            stagger_delay = (distance / 1000) * 0.5  # Max 0.5s stagger
-                            self.vanishing_nodes[node_id] = vanish_start_time + stagger_delay
-        
-        # Update vanishing animation
-        if self.vanishing_nodes:
-            nodes_to_remove = []
-            for node_id, vanish_start in self.vanishing_nodes.items():
-                if current_time >= vanish_start + self.vanish_duration:
-                    # Node has finished vanishing
-                    nodes_to_remove.append(node_id)
-                    self.bfs_visited_nodes.discard(node_id)
-                    self.current_exploring_nodes.discard(node_id)
-            
-            for node_id in nodes_to_remove:
-                del self.vanishing_nodes[node_id]
-            
-            # Check if all nodes have vanished
-            if not self.vanishing_nodes and self.bfs_complete:
-                self.is_animating_bfs = False
-    
-    def get_user_at_position(self, x: float, y: float) -> Optional[int]:
-        """Find user at given position"""
-        for user_id, user in self.users.items():
-            if user.distance_to(x, y) <= user.radius + 5:
-                return user_id
-        return None
-    
-    def select_user(self, user_id: int):
-        """Select a user as start point"""
-        # Reset previous selections
-        for user in self.users.values():
-            user.is_selected = False
-            user.is_target = False
-            
-        self.selected_user = user_id
-        self.users[user_id].is_selected = True
-        self.target_user = None
-        self.current_path = []
-        self.bfs_animation = []
-        self.animation_step = 0
-        self.path_found = False
-    
-    def select_target(self, user_id: int):
-        """Select a user as target point"""
-        if self.selected_user is not None and user_id != self.selected_user:
-            # Reset previous target
-            for user in self.users.values():
-                user.is_target = False
-                
-            self.target_user = user_id
-            self.users[user_id].is_target = True
-            self.start_bfs_animation()
-    
-    def reset_selection(self):
-        """Reset all selections"""
-        for user in self.users.values():
-            user.is_selected = False
-            user.is_target = False
-        self.selected_user = None
-        self.target_user = None
-        self.current_path = []
-        self.bfs_animation = []
-        self.animation_step = 0
-        self.path_found = False
-        
-        # Reset BFS visualization state
-        self.bfs_visited_nodes.clear()
-        self.current_exploring_nodes.clear()
-        self.vanishing_nodes.clear()
-        self.is_animating_bfs = False
-        self.bfs_complete = False
-        self.show_final_path_time = 0
+    FONT_SMALL = pygame.font.Font(None, 16)
+    FONT_MEDIUM = pygame.font.Font(None, 20)
+    FONT_LARGE = pygame.font.Font(None, 28)
+    FONT_TITLE = pygame.font.Font(None, 36)
+    return WIN
+
+
+def network_area() -> pygame.Rect:
+    """Screen area for the network, left of the panel and its border"""
+    return pygame.Rect(0, 0, WIDTH - PANEL_WIDTH - PANEL_BORDER, HEIGHT)
+
+
+def panel_area() -> pygame.Rect:
+    """Screen area owned by the panel, including the border that overhangs its left edge"""
+    return pygame.Rect(WIDTH - PANEL_WIDTH - PANEL_BORDER, 0, PANEL_WIDTH + PANEL_BORDER, HEIGHT)
+
 
 class UI:
     def __init__(self):
-        self.panel_width = 450  # Increased for larger screens
+        self.panel_width = PANEL_WIDTH  # Increased for larger screens
         self.panel_rect = pygame.Rect(WIDTH - self.panel_width, 0, self.panel_width, HEIGHT)
         
         # Buttons with better spacing for larger screens
@@ -490,6 +112,15 @@ class UI:
         self.mouse_over_exit = False
         self.mouse_over_regenerate = False
         self.mouse_over_fullscreen = False
+        
+        # Cached panel body and what is currently on screen, see draw_panel
+        self.panel_area = panel_area()
+        self.network_rect = network_area()
+        self.body_key = None
+        self.body: Optional[pygame.Surface] = None
+        self.status_rect: Optional[pygame.Rect] = None
+        self.status_key = None
+        self.button_states = {}
     
     def handle_mouse_hover(self, mouse_pos: Tuple[int, int]):
         """Handle mouse hover effects"""
@@ -499,8 +130,55 @@ class UI:
         self.mouse_over_regenerate = self.regenerate_button.collidepoint(mouse_pos)
         self.mouse_over_fullscreen = self.fullscreen_button.collidepoint(mouse_pos)
     
-    def draw_panel(self, win: pygame.Surface, network: SocialNetwork):
-        """Draw the information panel"""
+    def draw_panel(self, win: pygame.Surface, network: SocialNetwork) -> List[pygame.Rect]:
+        """Draw the information panel, returning the screen rects that changed.
+        
+        The panel body is only redrawn when what it shows changes, and is kept
+        as a Surface. The BFS status line and the buttons change on their own
+        (animation progress, hover) and are patched over the cached body.
+        """
+        dirty = []
+        body_key = (network, network.version, WIDTH, HEIGHT, network.selected_user, network.target_user,
+                    network.path_edges, network.path_found, network.degrees_of_separation,
+                    network.nodes_explored, network.search_mode, network.path_cache_hits,
+                    network.path_cache_misses, network.is_animating_bfs, network.search_error)
+        if body_key != self.body_key:
+            self.body_key = body_key
+            self.status_rect = self.draw_body(win, network)
+            self.body = win.subsurface(self.panel_area).copy()
+            self.status_key = None
+            self.button_states = {}
+            dirty.append(self.panel_area)
+        
+        # BFS Animation Status
+        if self.status_rect is not None:
+            if not network.bfs_complete:
+                levels = f"/{network.animation_levels}" if network.animation_levels else ""
+                status = (f"🔍 Exploring Level {network.animation_step}{levels}", (255, 255, 0))
+            elif network.vanishing_nodes:
+                status = (f"✨ Nodes vanishing... ({len(network.vanishing_nodes)} left)", (255, 150, 255))
+            else:
+                status = ("🎉 BFS Complete!", (100, 255, 100))
+            if status != self.status_key:
+                self.status_key = status
+                self.restore_body(win, self.status_rect)
+                win.blit(render_text(FONT_SMALL, status[0], status[1]), self.status_rect.topleft)
+                dirty.append(self.status_rect)
+        
+        dirty.extend(self.draw_buttons(win))
+        return dirty
+    
+    def restore_body(self, win: pygame.Surface, rect: pygame.Rect):
+        """Copy the cached panel body back over part of the screen"""
+        win.blit(self.body, rect, rect.move(-self.panel_area.x, -self.panel_area.y))
+    
+    def draw_body(self, win: pygame.Surface, network: SocialNetwork) -> Optional[pygame.Rect]:
+        """Draw everything in the panel except buttons and the BFS status line.
+        
+        Returns where the status line goes, or None when it isn't shown.
+        """
+        status_rect = None
+        
         # Panel background with gradient effect
         pygame.draw.rect(win, PANEL_COLOR, self.panel_rect)
         pygame.draw.rect(win, (40, 45, 60), self.panel_rect, 3)
@@ -512,11 +190,11 @@ class UI:
         y_offset = 30
         
         # Title with Indian flag colors accent
-        title = FONT_TITLE.render("इंडिग्राम", True, (255, 140, 0))
+        title = render_text(FONT_TITLE, "इंडिग्राम", (255, 140, 0))
         win.blit(title, (WIDTH - self.panel_width + 30, y_offset))
         y_offset += 35
         
-        subtitle = FONT_MEDIUM.render("Indigram - Social Network BFS", True, TEXT_COLOR)
+        subtitle = render_text(FONT_MEDIUM, "Indigram - Social Network BFS", TEXT_COLOR)
         win.blit(subtitle, (WIDTH - self.panel_width + 30, y_offset))
         y_offset += 50
         
@@ -533,12 +211,18 @@ class UI:
             "",
             "📊 Network Statistics:",
             f"• कुल उपयोगकर्ता: {len(network.users)}",
-            f"• Total Connections: {sum(len(connections) for connections in network.connections.values()) // 2}",
-            f"• Average Connections: {sum(len(connections) for connections in network.connections.values()) // len(network.users):.1f}",
+            f"• Total Connections: {network.stats.num_edges}",
+            f"• Average Connections: {network.stats.average_degree:.1f}",
+            f"• Max Connections: {network.stats.max_degree}, Components: {network.stats.num_components}",
+            f"• Search Mode: {SEARCH_MODE_LABELS[network.search_mode]}",
+            f"• Path Cache: {network.path_cache_hits} hits / {network.path_cache_misses} misses",
             "",
             "🎮 Keyboard Shortcuts:",
             "• R: Reset selection",
             "• Space: Random demo",
+            "• B: Cycle search mode",
+            "• S: Toggle stats view",
+            "• Wheel/Right-drag/Arrows: Zoom, pan; 0: Fit",
             "• F11: Toggle fullscreen",
             "• ESC: Exit",
             "",
@@ -546,11 +230,11 @@ class UI:
         
         for instruction in instructions:
             if instruction.startswith("🎯") or instruction.startswith("📊"):
-                text = FONT_MEDIUM.render(instruction, True, (255, 215, 0))
+                text = render_text(FONT_MEDIUM, instruction, (255, 215, 0))
             elif instruction.startswith("•"):
-                text = FONT_SMALL.render(instruction, True, (220, 220, 220))
+                text = render_text(FONT_SMALL, instruction, (220, 220, 220))
             else:
-                text = FONT_SMALL.render(instruction, True, TEXT_COLOR)
+                text = render_text(FONT_SMALL, instruction, TEXT_COLOR)
             win.blit(text, (WIDTH - self.panel_width + 30, y_offset))
             y_offset += 22
         
@@ -563,19 +247,19 @@ class UI:
             pygame.draw.rect(win, (40, 20, 60), info_rect)
             pygame.draw.rect(win, SELECTED_USER, info_rect, 2)
             
-            text = FONT_MEDIUM.render("🎯 Selected User:", True, SELECTED_USER)
+            text = render_text(FONT_MEDIUM, "🎯 Selected User:", SELECTED_USER)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 25
             
-            text = FONT_SMALL.render(f"• नाम: {user.name}", True, TEXT_COLOR)
+            text = render_text(FONT_SMALL, f"• नाम: {user.name}", TEXT_COLOR)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 18
             
-            text = FONT_SMALL.render(f"• ID: {user.id}", True, TEXT_COLOR)
+            text = render_text(FONT_SMALL, f"• ID: {user.id}", TEXT_COLOR)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 18
             
-            text = FONT_SMALL.render(f"• Connections: {len(user.connections)}", True, TEXT_COLOR)
+            text = render_text(FONT_SMALL, f"• Connections: {network.connections.degree(user.id)}", TEXT_COLOR)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 25
         
@@ -588,11 +272,11 @@ class UI:
             pygame.draw.rect(win, (20, 40, 20), info_rect)
             pygame.draw.rect(win, TARGET_USER, info_rect, 2)
             
-            text = FONT_MEDIUM.render("🎯 Target User:", True, TARGET_USER)
+            text = render_text(FONT_MEDIUM, "🎯 Target User:", TARGET_USER)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 25
             
-            text = FONT_SMALL.render(f"• नाम: {target_user.name}", True, TEXT_COLOR)
+            text = render_text(FONT_SMALL, f"• नाम: {target_user.name}", TEXT_COLOR)
             win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
             y_offset += 20
             
@@ -602,36 +286,30 @@ class UI:
                 pygame.draw.rect(win, (20, 40, 20), success_rect)
                 pygame.draw.rect(win, PATH_COLOR, success_rect, 2)
                 
-                text = FONT_MEDIUM.render("✅ Path Found!", True, PATH_COLOR)
+                text = render_text(FONT_MEDIUM, "✅ Path Found!", PATH_COLOR)
                 win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                 y_offset += 25
                 
-                text = FONT_SMALL.render(f"🔗 Degrees of Separation: {network.degrees_of_separation}", True, (255, 215, 0))
+                text = render_text(FONT_SMALL, f"🔗 Degrees of Separation: {network.degrees_of_separation}", (255, 215, 0))
+                win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                y_offset += 20
+                
+                text = render_text(FONT_SMALL, f"📏 Path Length: {len(network.current_path)} users", TEXT_COLOR)
                 win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                 y_offset += 20
                 
-                text = FONT_SMALL.render(f"📏 Path Length: {len(network.current_path)} users", True, TEXT_COLOR)
+                text = render_text(FONT_SMALL, f"🔎 Nodes Explored: {network.nodes_explored}", TEXT_COLOR)
                 win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                 y_offset += 20
                 
-                # BFS Animation Status
+                # BFS Animation Status, filled in by draw_panel
                 if network.is_animating_bfs:
-                    if not network.bfs_complete:
-                        status_text = f"🔍 Exploring Level {network.animation_step}/{len(network.bfs_animation)}"
-                        text = FONT_SMALL.render(status_text, True, (255, 255, 0))
-                    else:
-                        if network.vanishing_nodes:
-                            status_text = f"✨ Nodes vanishing... ({len(network.vanishing_nodes)} left)"
-                            text = FONT_SMALL.render(status_text, True, (255, 150, 255))
-                        else:
-                            status_text = "🎉 BFS Complete!"
-                            text = FONT_SMALL.render(status_text, True, (100, 255, 100))
-                    win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                    status_rect = pygame.Rect(WIDTH - self.panel_width + 25, y_offset, self.panel_width - 50, 18)
                     y_offset += 20
                 
                 # Show path
                 if len(network.current_path) <= 8:  # Only show if path is not too long
-                    text = FONT_SMALL.render("🛤️ Path:", True, (255, 255, 100))
+                    text = render_text(FONT_SMALL, "🛤️ Path:", (255, 255, 100))
                     win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                     y_offset += 18
                     
@@ -640,154 +318,587 @@ class UI:
                         if len(user_name) > 12:
                             user_name = user_name[:12] + "..."
                         connector = " → " if i < len(network.current_path) - 1 else ""
-                        text = FONT_SMALL.render(f"{user_name}{connector}", True, PATH_COLOR)
+                        text = render_text(FONT_SMALL, f"{user_name}{connector}", PATH_COLOR)
                         win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                         y_offset += 16
                 y_offset += 10
+            elif network.search_pending:
+                # The search runs alongside the animation; results follow when it ends
+                text = render_text(FONT_MEDIUM, "🔍 Searching...", (255, 255, 0))
+                win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                y_offset += 25
+                
+                if network.degrees_of_separation is not None and network.degrees_of_separation >= 0:
+                    text = render_text(FONT_SMALL, f"🔗 Degrees of Separation: {network.degrees_of_separation}", (255, 215, 0))
+                    win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                    y_offset += 20
+                
+                text = render_text(FONT_SMALL, f"🔎 Nodes Explored: {network.nodes_explored}", TEXT_COLOR)
+                win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                y_offset += 20
+                
+                # BFS Animation Status, filled in by draw_panel
+                status_rect = pygame.Rect(WIDTH - self.panel_width + 25, y_offset, self.panel_width - 50, 18)
+                y_offset += 20
+            elif network.search_error is not None:
+                # The search raised; show why instead of ending the app
+                error_rect = pygame.Rect(WIDTH - self.panel_width + 20, y_offset - 5, self.panel_width - 40, 60)
+                pygame.draw.rect(win, (40, 20, 20), error_rect)
+                pygame.draw.rect(win, (255, 100, 100), error_rect, 2)
+                
+                text = render_text(FONT_MEDIUM, "⚠️ Search Failed", (255, 100, 100))
+                win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                y_offset += 25
+                
+                message = network.search_error
+                if len(message) > 48:
+                    message = message[:48] + "..."
+                text = render_text(FONT_SMALL, message, TEXT_COLOR)
+                win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
+                y_offset += 35
             elif network.degrees_of_separation == -1:
                 # Error box
                 error_rect = pygame.Rect(WIDTH - self.panel_width + 20, y_offset - 5, self.panel_width - 40, 40)
                 pygame.draw.rect(win, (40, 20, 20), error_rect)
                 pygame.draw.rect(win, (255, 100, 100), error_rect, 2)
                 
-                text = FONT_MEDIUM.render("❌ No Path Found!", True, (255, 100, 100))
+                text = render_text(FONT_MEDIUM, "❌ No Path Found!", (255, 100, 100))
                 win.blit(text, (WIDTH - self.panel_width + 25, y_offset))
                 y_offset += 40
         
+        return status_rect
+    
+    def draw_buttons(self, win: pygame.Surface) -> List[pygame.Rect]:
+        """Redraw buttons whose hover state changed, returning their rects"""
         # Buttons with enhanced styling
-        reset_color = BUTTON_HOVER if self.mouse_over_reset else BUTTON_COLOR
-        random_color = BUTTON_HOVER if self.mouse_over_random else BUTTON_COLOR
-        exit_color = EXIT_BUTTON_HOVER if self.mouse_over_exit else EXIT_BUTTON_COLOR
-        regenerate_color = BUTTON_HOVER if self.mouse_over_regenerate else BUTTON_COLOR
-        fullscreen_color = BUTTON_HOVER if self.mouse_over_fullscreen else BUTTON_COLOR
+        buttons = [
+            # Fullscreen Toggle, Regenerate Network, Reset, Random Demo and Exit
+            (self.fullscreen_button, "🖥️ Toggle Fullscreen (F11)", self.mouse_over_fullscreen, BUTTON_COLOR, BUTTON_HOVER),
+            (self.regenerate_button, "🔄 Regenerate Network", self.mouse_over_regenerate, BUTTON_COLOR, BUTTON_HOVER),
+            (self.reset_button, "🔄 Reset", self.mouse_over_reset, BUTTON_COLOR, BUTTON_HOVER),
+            (self.random_button, "🎲 Random Demo", self.mouse_over_random, BUTTON_COLOR, BUTTON_HOVER),
+            (self.exit_button, "🚪 Exit Indigram", self.mouse_over_exit, EXIT_BUTTON_COLOR, EXIT_BUTTON_HOVER),
+        ]
+        
+        dirty = []
+        for button, label, hovered, color, hover_color in buttons:
+            if self.button_states.get(label) == hovered:
+                continue
+            self.button_states[label] = hovered
+            
+            self.restore_body(win, button)
+            pygame.draw.rect(win, hover_color if hovered else color, button, border_radius=8)
+            pygame.draw.rect(win, TEXT_COLOR, button, 3, border_radius=8)
+            text = render_text(FONT_MEDIUM, label, TEXT_COLOR)
+            win.blit(text, text.get_rect(center=button.center))
+            dirty.append(button)
+        return dirty
+
+def draw_connection(win: pygame.Surface, user_x: float, user_y: float,
+                    connected_x: float, connected_y: float, color: Tuple[int, int, int], width: int,
+                    zoom: float = 1.0):
+    """Draw connection (in screen coordinates) with slight curve for better visual appeal"""
+    curve_offset = (10 if width > 2 else 5) * zoom
+    
+    # Simple curved line approximation using multiple segments
+    segments = 8
+    points = []
+    for i in range(segments + 1):
+        t = i / segments
+        points.append((user_x * (1-t) + connected_x * t,
+                       user_y * (1-t) + connected_y * t + math.sin(t * math.pi) * curve_offset))
+    pygame.draw.lines(win, color, False, points, width)
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (font, text, colour)"""
+    
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.surfaces: "OrderedDict[Tuple[pygame.font.Font, str, Tuple[int, ...]], pygame.Surface]" = OrderedDict()
+    
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+    """Antialiased text, rendered once and reused while it stays in TEXT_CACHE.
+    
+    The surface is shared, so draw it but don't modify it.
+    """
+    return TEXT_CACHE.render(font, text, color)
+
+
+class Camera:
+    """Pan/zoom view onto the layout: screen = (world - (x, y)) * zoom.
+    
+    Only the network area left of the panel is treated as the viewport.
+    At zoom 1 with no offset, world and screen coordinates coincide.
+    """
+    
+    MAX_ZOOM = 4.0
+    # Below this zoom users and edges are drawn as dots and thin lines
+    LOD_ZOOM = 0.5
+    
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = 1.0
+        self.min_zoom = 0.5
+        self.dragging = False
+    
+    @property
+    def lod(self) -> bool:
+        return self.zoom < self.LOD_ZOOM
+    
+    def fit(self, network: SocialNetwork):
+        """Zoom out until the whole layout fits the viewport, centred"""
+        view_width, view_height = WIDTH - PANEL_WIDTH, HEIGHT
+        world_width, world_height = network.width - network.panel_width, network.height
+        self.zoom = min(1.0, view_width / world_width, view_height / world_height)
+        self.min_zoom = self.zoom / 2
+        self.x = (world_width - view_width / self.zoom) / 2
+        self.y = (world_height - view_height / self.zoom) / 2
+    
+    def to_world(self, screen_x: float, screen_y: float) -> Tuple[float, float]:
+        return screen_x / self.zoom + self.x, screen_y / self.zoom + self.y
+    
+    def to_screen(self, world_x: float, world_y: float) -> Tuple[float, float]:
+        return (world_x - self.x) * self.zoom, (world_y - self.y) * self.zoom
+    
+    def pan(self, dx: float, dy: float):
+        """Move the view by a screen-space offset"""
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+    
+    def zoom_at(self, factor: float, screen_pos: Tuple[int, int]):
+        """Zoom by factor while keeping the world point under screen_pos in place"""
+        world_x, world_y = self.to_world(*screen_pos)
+        self.zoom = max(self.min_zoom, min(self.MAX_ZOOM, self.zoom * factor))
+        self.x = world_x - screen_pos[0] / self.zoom
+        self.y = world_y - screen_pos[1] / self.zoom
+    
+    def view_rect(self, margin: float = 0) -> Tuple[float, float, float, float]:
+        """World rectangle (x0, y0, x1, y1) shown in the viewport, grown by a screen margin"""
+        x0, y0 = self.to_world(-margin, -margin)
+        x1, y1 = self.to_world(WIDTH - PANEL_WIDTH + margin, HEIGHT + margin)
+        return x0, y0, x1, y1
+
+
+class EdgeLayer:
+    """Offscreen surface holding every connection that looks the same each frame.
+    
+    Edges only change on regenerate, resize or add_connection, so the
+    visible ones are drawn once and blitted per frame. Edges on the current
+    path and edges touching nodes scheduled to vanish are left out for
+    draw_network to animate; the visible ones touching vanishing nodes are
+    kept in vanish_edges so it only draws what is in view. The layer is
+    rebuilt when either of those sets or the camera changes. While the camera is being dragged the old layer
+    is shifted instead, and redrawn once the drag ends.
+    
+    When zoomed out (camera.lod) plain users are baked into the layer as
+    dots, and edges are drawn as thin straight lines, or skipped altogether
+    if more than LOD_MAX_EDGES are visible.
+    """
+    
+    LOD_MAX_EDGES = 20000
+    
+    def __init__(self):
+        self.key = None
+        self.layer = None
+        self.origin = (0.0, 0.0)
+        self.edges_drawn = True
+        # Visible edges touching a node scheduled to vanish, path edges excluded
+        self.vanish_edges: List[Tuple[int, int]] = []
+    
+    def surface(self, network: SocialNetwork, camera: Camera) -> Tuple[pygame.Surface, Tuple[float, float]]:
+        """The layer and the screen offset to blit it at"""
+        # Holding the network itself in the key keeps ids from being reused
+        key = (network, network.version, WIDTH, HEIGHT, network.path_edges,
+               network.vanish_scheduled, camera.zoom)
+        if key != self.key or (self.origin != (camera.x, camera.y) and not camera.dragging):
+            self.key = key
+            self.origin = (camera.x, camera.y)
+            self.layer = self.render(network, camera)
+        offset = ((self.origin[0] - camera.x) * camera.zoom, (self.origin[1] - camera.y) * camera.zoom)
+        return self.layer, offset
+    
+    def render(self, network: SocialNetwork, camera: Camera) -> pygame.Surface:
+        layer = pygame.Surface((WIDTH, HEIGHT))
+        layer.fill((0, 0, 0))
+        # Black is never an edge colour, so it can stand in for transparency
+        layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
         
-        # Fullscreen Toggle button
-        pygame.draw.rect(win, fullscreen_color, self.fullscreen_button, border_radius=8)
-        pygame.draw.rect(win, TEXT_COLOR, self.fullscreen_button, 3, border_radius=8)
-        fullscreen_text = FONT_MEDIUM.render("🖥️ Toggle Fullscreen (F11)", True, TEXT_COLOR)
-        fullscreen_rect = fullscreen_text.get_rect(center=self.fullscreen_button.center)
-        win.blit(fullscreen_text, fullscreen_rect)
+        xs, ys = network.users.xs, network.users.ys
+        cam_x, cam_y, zoom = camera.x, camera.y, camera.zoom
+        scheduled = network.vanish_scheduled
+        view = camera.view_rect(margin=20)
+        edges = network.edges_in_rect(*view)
         
-        # Regenerate Network button
-        pygame.draw.rect(win, regenerate_color, self.regenerate_button, border_radius=8)
-        pygame.draw.rect(win, TEXT_COLOR, self.regenerate_button, 3, border_radius=8)
-        regenerate_text = FONT_MEDIUM.render("🔄 Regenerate Network", True, TEXT_COLOR)
-        regenerate_rect = regenerate_text.get_rect(center=self.regenerate_button.center)
-        win.blit(regenerate_text, regenerate_rect)
+        self.edges_drawn = not camera.lod or len(edges) <= self.LOD_MAX_EDGES
+        self.vanish_edges = []
+        if self.edges_drawn:
+            for user_id, connected_id in edges:
+                if (user_id, connected_id) in network.path_edges:
+                    continue
+                if user_id in scheduled or connected_id in scheduled:
+                    self.vanish_edges.append((user_id, connected_id))
+                    continue
+                user_x, user_y = (xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom
+                connected_x, connected_y = (xs[connected_id] - cam_x) * zoom, (ys[connected_id] - cam_y) * zoom
+                if camera.lod:
+                    pygame.draw.line(layer, CONNECTION_COLOR, (user_x, user_y), (connected_x, connected_y))
+                else:
+                    draw_connection(layer, user_x, user_y, connected_x, connected_y, CONNECTION_COLOR, 2, zoom)
         
-        # Reset button
-        pygame.draw.rect(win, reset_color, self.reset_button, border_radius=8)
-        pygame.draw.rect(win, TEXT_COLOR, self.reset_button, 3, border_radius=8)
-        reset_text = FONT_MEDIUM.render("🔄 Reset", True, TEXT_COLOR)
-        reset_rect = reset_text.get_rect(center=self.reset_button.center)
-        win.blit(reset_text, reset_rect)
+        if camera.lod:
+            # Plain users as dots; users in any BFS state are drawn on top every frame
+            size = max(1, int(10 * zoom))
+            for user_id in network.users_in_rect(*view):
+                if user_id not in scheduled:
+                    layer.fill(USER_COLOR, ((xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom, size, size))
+        return layer
+
+
+class BackgroundLayer:
+    """Vertical gradient background, rendered once per window size"""
+    
+    def __init__(self):
+        self.size = None
+        self.layer = None
+    
+    def surface(self) -> pygame.Surface:
+        if self.size != (WIDTH, HEIGHT):
+            self.size = (WIDTH, HEIGHT)
+            self.layer = pygame.Surface(self.size)
+            for y in range(0, HEIGHT, 4):
+                gradient_color = (
+                    int(8 + (y / HEIGHT) * 12),
+                    int(10 + (y / HEIGHT) * 15),
+                    int(20 + (y / HEIGHT) * 25)
+                )
+                pygame.draw.rect(self.layer, gradient_color, (0, y, WIDTH, 4))
+        return self.layer
+
+
+class SpriteCache:
+    """Translucent circles for glow, ripple and sparkle effects, rendered on first use.
+    
+    Alpha is rounded to ALPHA_STEP so animated effects reuse a small set of
+    sprites instead of allocating a new SRCALPHA surface per circle per frame.
+    """
+    
+    ALPHA_STEP = 4
+    MAX_SPRITES = 4096
+    
+    def __init__(self):
+        self.sprites = {}
+    
+    def circle(self, color: Tuple[int, int, int], radius: int, alpha: int, width: int = 0) -> pygame.Surface:
+        """Circle of the given radius centred in a (2 * radius) square surface"""
+        alpha = min(255, round(alpha / self.ALPHA_STEP) * self.ALPHA_STEP)
+        key = (color, radius, alpha, width)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if len(self.sprites) >= self.MAX_SPRITES:
+                self.sprites.clear()
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius, width)
+            self.sprites[key] = sprite
+        return sprite
+
+
+class StatsView:
+    """Overlay with the degree distribution and the separation histogram.
+    
+    Rendered once per graph version. The separation histogram needs a BFS
+    per sampled user, so it is computed on the worker thread once the view
+    is shown, and the overlay says so until it arrives.
+    """
+    
+    SIZE = (440, 330)
+    # Separation is exact up to EXACT_USERS users, else estimated from SOURCES of them
+    EXACT_USERS = 1000
+    SOURCES = 16
+    
+    def __init__(self):
+        self.visible = False
+        self.key = None
+        self.layer = None
+        # (network, edge count, histogram, unreachable) from the last separation job
+        self.separation = None
+    
+    def needs_separation(self, network: SocialNetwork) -> bool:
+        """The view is shown but has no separation histogram for this graph yet"""
+        return self.visible and self.separation_for(network) is None
+    
+    def separation_for(self, network: SocialNetwork) -> Optional[Tuple[List[int], int]]:
+        if self.separation is None or self.separation[:2] != (network, network.stats.num_edges):
+            return None
+        return self.separation[2], self.separation[3]
+    
+    @classmethod
+    def compute_separation(cls, network: SocialNetwork):
+        """Background job: the separation histogram, tagged with the graph it was computed on"""
+        num_edges = network.stats.num_edges
+        histogram, unreachable = network.separation_histogram(cls.EXACT_USERS, cls.SOURCES)
+        return network, num_edges, histogram, unreachable
+    
+    def surface(self, network: SocialNetwork) -> pygame.Surface:
+        key = (network, network.version, self.separation_for(network) is not None)
+        if key != self.key:
+            self.key = key
+            self.layer = self.render(network)
+        return self.layer
+    
+    def render(self, network: SocialNetwork) -> pygame.Surface:
+        width, height = self.SIZE
+        layer = pygame.Surface(self.SIZE, pygame.SRCALPHA)
+        pygame.draw.rect(layer, (0, 0, 0, 200), (0, 0, width, height), border_radius=8)
+        pygame.draw.rect(layer, (255, 140, 0), (0, 0, width, height), 2, border_radius=8)
         
-        # Random Demo button
-        pygame.draw.rect(win, random_color, self.random_button, border_radius=8)
-        pygame.draw.rect(win, TEXT_COLOR, self.random_button, 3, border_radius=8)
-        random_text = FONT_MEDIUM.render("🎲 Random Demo", True, TEXT_COLOR)
-        random_rect = random_text.get_rect(center=self.random_button.center)
-        win.blit(random_text, random_rect)
+        stats = network.stats
+        layer.blit(render_text(FONT_MEDIUM, "📊 Degree Distribution", (255, 215, 0)), (15, 12))
+        layer.blit(render_text(FONT_SMALL, f"{stats.num_edges} connections, average {stats.average_degree:.1f}, "
+                                           f"max {stats.max_degree}, {stats.num_components} components",
+                               TEXT_COLOR), (15, 32))
+        self.draw_bars(layer, pygame.Rect(15, 50, width - 30, 95), stats.degree_histogram, (100, 200, 255))
         
-        # Exit button
-        pygame.draw.rect(win, exit_color, self.exit_button, border_radius=8)
-        pygame.draw.rect(win, TEXT_COLOR, self.exit_button, 3, border_radius=8)
-        exit_text = FONT_MEDIUM.render("🚪 Exit Indigram", True, TEXT_COLOR)
-        exit_rect = exit_text.get_rect(center=self.exit_button.center)
-        win.blit(exit_text, exit_rect)
+        layer.blit(render_text(FONT_MEDIUM, "🔗 Degrees of Separation", (255, 215, 0)), (15, 170))
+        separation = self.separation_for(network)
+        if separation is None:
+            layer.blit(render_text(FONT_SMALL, "Computing...", TEXT_COLOR), (15, 190))
+            return layer
+        histogram, unreachable = separation
+        pairs = sum(histogram) + unreachable
+        sampled = len(network.users) > self.EXACT_USERS
+        average = sum(d * count for d, count in enumerate(histogram)) / max(1, sum(histogram))
+        summary = f"average {average:.2f}, {100 * unreachable / max(1, pairs):.1f}% unreachable"
+        if sampled:
+            summary += f" (estimated from {self.SOURCES} users)"
+        layer.blit(render_text(FONT_SMALL, summary, TEXT_COLOR), (15, 190))
+        self.draw_bars(layer, pygame.Rect(15, 208, width - 30, 95), histogram, PATH_COLOR)
+        return layer
+    
+    @staticmethod
+    def draw_bars(layer: pygame.Surface, rect: pygame.Rect, values: List[int], color: Tuple[int, int, int]):
+        """Bar chart of values[i] for i = 0.. with every few indices labelled underneath"""
+        if not values or max(values) == 0:
+            return
+        peak = max(values)
+        bar_width = rect.width / len(values)
+        label_every = max(1, int(24 / bar_width) + 1)
+        for index, value in enumerate(values):
+            bar_height = int((rect.height - 14) * value / peak)
+            left = rect.x + index * bar_width
+            if bar_height:
+                pygame.draw.rect(layer, color, (left, rect.bottom - 14 - bar_height, max(1, bar_width - 1), bar_height))
+            if index % label_every == 0:
+                layer.blit(render_text(FONT_SMALL, str(index), (180, 180, 180)), (left, rect.bottom - 11))
 
-def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: float):
+
+CAMERA = Camera()
+STATS_VIEW = StatsView()
+EDGE_LAYER = EdgeLayer()
+BACKGROUND_LAYER = BackgroundLayer()
+SPRITES = SpriteCache()
+
+
+def draw_dots(win: pygame.Surface, network: SocialNetwork, camera: Camera, user_ids: Set[int],
+              color: Tuple[int, int, int], size: int):
+    """Square dots for many users at once, faded like the full view while they vanish.
+    
+    Users on the current path are skipped (they are drawn in PATH_COLOR).
+    With NumPy the dots are written straight into the pixel buffer, which
+    keeps a BFS over tens of thousands of users at interactive frame rates.
+    """
+    if not user_ids:
+        return
+    cam_x, cam_y, zoom = camera.x, camera.y, camera.zoom
+    alphas = network.users.alphas
+    
+    if np is None:
+        xs, ys = network.users.xs, network.users.ys
+        for user_id in user_ids:
+            if user_id in network.path_index:
+                continue
+            dot_color = color
+            alpha = alphas[user_id]
+            if alpha < 1.0:
+                if alpha <= 0:
+                    continue
+                dot_color = tuple(int(c * alpha) for c in color)
+            win.fill(dot_color, ((xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom, size, size))
+        return
+    
+    ids = np.fromiter(user_ids, dtype=np.int64, count=len(user_ids))
+    if network.path_index:
+        ids = ids[~np.isin(ids, np.fromiter(network.path_index, dtype=np.int64))]
+    
+    # Alpha in 16 steps, 16 = full colour
+    alpha = np.rint(np.frombuffer(alphas, dtype=np.float32)[ids] * 16).astype(np.int64)
+    
+    screen_x = ((np.frombuffer(network.users.xs, dtype=float)[ids] - cam_x) * zoom).astype(np.int64)
+    screen_y = ((np.frombuffer(network.users.ys, dtype=float)[ids] - cam_y) * zoom).astype(np.int64)
+    keep = ((alpha > 0) & (screen_x >= 0) & (screen_x <= WIDTH - size) &
+            (screen_y >= 0) & (screen_y <= HEIGHT - size))
+    if not keep.any():
+        return
+    screen_x, screen_y, alpha = screen_x[keep], screen_y[keep], alpha[keep]
+    
+    shades = np.array([win.map_rgb(tuple(int(c * step / 16) for c in color)) for step in range(17)])
+    values = shades[alpha]
+    pixels = pygame.surfarray.pixels2d(win)
+    for dx in range(size):
+        for dy in range(size):
+            pixels[screen_x + dx, screen_y + dy] = values
+    del pixels  # Unlocks the surface
+
+
+def draw_users_lod(win: pygame.Surface, network: SocialNetwork, camera: Camera):
+    """Zoomed-out users: plain users are dots in the edge layer, so only users in
+    a BFS state are drawn here, as flat dots without glows, ripples or sparkles"""
+    xs, ys = network.users.xs, network.users.ys
+    cam_x, cam_y, zoom = camera.x, camera.y, camera.zoom
+    size = max(2, int(12 * zoom))
+    
+    if network.is_animating_bfs:
+        draw_dots(win, network, camera, network.bfs_visited_nodes, (100, 200, 255), size)
+        draw_dots(win, network, camera, network.current_exploring_nodes, (255, 255, 0), size)
+    
+    if network.bfs_complete or not network.is_animating_bfs:
+        for user_id in network.path_index:
+            win.fill(PATH_COLOR, ((xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom, size, size))
+    
+    # Start and target stay large enough to find, with their names
+    for user_id, color in ((network.selected_user, SELECTED_USER), (network.target_user, TARGET_USER)):
+        if user_id is None:
+            continue
+        user_x, user_y = (xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom
+        pygame.draw.circle(win, color, (int(user_x), int(user_y)), 5)
+        pygame.draw.circle(win, TEXT_COLOR, (int(user_x), int(user_y)), 5, 1)
+        text = render_text(FONT_SMALL, network.users.name_of(user_id), TEXT_COLOR)
+        win.blit(text, text.get_rect(center=(user_x, user_y - 14)))
+
+
+def draw_hover(win: pygame.Surface, network: SocialNetwork, user_id: int, camera: Camera):
+    """Ring around the user under the mouse, with its name and connection count below"""
+    user = network.users[user_id]
+    user_x, user_y = camera.to_screen(user.x, user.y)
+    radius = int(user.radius * camera.zoom) + 5
+    pygame.draw.circle(win, TEXT_COLOR, (int(user_x), int(user_y)), radius, 2)
+    
+    label = f"{user.name} · {network.connections.degree(user_id)} connections"
+    text_surface = render_text(FONT_SMALL, label, TEXT_COLOR)
+    text_rect = text_surface.get_rect(midtop=(user_x, user_y + radius + 6))
+    pygame.draw.rect(win, (0, 0, 0), text_rect.inflate(8, 4), border_radius=4)
+    win.blit(text_surface, text_rect)
+
+
+def draw_spinner(win: pygame.Surface, label: str, current_time: float, failed: bool = False):
+    """Spinning arc and label at the bottom of the network area, shown while a
+    background job is running; with failed, a red box without the arc instead"""
+    color = (255, 100, 100) if failed else PATH_COLOR
+    text_surface = render_text(FONT_MEDIUM, label, TEXT_COLOR)
+    area = network_area()
+    text_rect = text_surface.get_rect(midleft=(area.centerx - text_surface.get_width() // 2 + 16, area.bottom - 50))
+    bg_rect = text_rect.inflate(56, 16).move(-16, 0)
+    pygame.draw.rect(win, (0, 0, 0), bg_rect, border_radius=5)
+    pygame.draw.rect(win, color, bg_rect, 2, border_radius=5)
+    win.blit(text_surface, text_rect)
+    if failed:
+        return
+    
+    arc_rect = pygame.Rect(0, 0, 20, 20)
+    arc_rect.midright = (text_rect.left - 10, text_rect.centery)
+    angle = (current_time * 6) % (2 * math.pi)
+    pygame.draw.arc(win, PATH_COLOR, arc_rect, angle, angle + 4.5, 3)
+
+
+def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: float,
+                 hover_user: Optional[int] = None, busy_label: Optional[str] = None,
+                 error_label: Optional[str] = None):
     """Draw the entire social network with enhanced BFS visualization"""
-    # Create gradient background
-    for y in range(0, HEIGHT, 4):
-        gradient_color = (
-            int(8 + (y / HEIGHT) * 12),
-            int(10 + (y / HEIGHT) * 15),
-            int(20 + (y / HEIGHT) * 25)
-        )
-        pygame.draw.rect(win, gradient_color, (0, y, WIDTH, 4))
-    
-    # Draw connections first (so they appear behind users)
-    for user_id, user in network.users.items():
-        for connected_id in user.connections:
-            if user_id < connected_id:  # Draw each connection only once
-                connected_user = network.users[connected_id]
-                
-                # Determine connection color and style
-                color = CONNECTION_COLOR
-                width = 2
-                
-                # Highlight path connections with animated effect
-                if (network.current_path and 
-                    user_id in network.current_path and 
-                    connected_id in network.current_path):
-                    
-                    user_index = network.current_path.index(user_id)
-                    connected_index = network.current_path.index(connected_id)
-                    
-                    if abs(user_index - connected_index) == 1:
-                        # Animated path connection
-                        pulse = math.sin(current_time * 3) * 0.3 + 0.7
-                        color = tuple(int(c * pulse) for c in HIGHLIGHT_PATH)
-                        width = 4
-                
-                # Dim connections to vanishing nodes
-                user_vanishing = user_id in network.vanishing_nodes
-                connected_vanishing = connected_id in network.vanishing_nodes
-                
-                if user_vanishing or connected_vanishing:
-                    vanish_progress = 0
-                    if user_vanishing:
-                        vanish_start = network.vanishing_nodes[user_id]
-                        vanish_progress = max(vanish_progress, 
-                            min(1.0, (current_time - vanish_start) / network.vanish_duration))
-                    if connected_vanishing:
-                        vanish_start = network.vanishing_nodes[connected_id]
-                        vanish_progress = max(vanish_progress,
-                            min(1.0, (current_time - vanish_start) / network.vanish_duration))
-                    
-                    # Fade out the connection
-                    alpha = 1.0 - vanish_progress
-                    color = tuple(int(c * alpha) for c in color)
-                    width = max(1, int(width * alpha))
-                
-                # Draw connection with slight curve for better visual appeal
-                start_pos = (user.x, user.y)
-                end_pos = (connected_user.x, connected_user.y)
-                
-                # Calculate control point for curve
-                curve_offset = 10 if width > 2 else 5
-                
-                # Simple curved line approximation using multiple segments
-                segments = 8
-                for i in range(segments):
-                    t1 = i / segments
-                    t2 = (i + 1) / segments
-                    
-                    x1 = user.x * (1-t1) + connected_user.x * t1
-                    y1 = user.y * (1-t1) + connected_user.y * t1 + math.sin(t1 * math.pi) * curve_offset
-                    
-                    x2 = user.x * (1-t2) + connected_user.x * t2
-                    y2 = user.y * (1-t2) + connected_user.y * t2 + math.sin(t2 * math.pi) * curve_offset
-                    
-                    if width > 0:
-                        pygame.draw.line(win, color, (x1, y1), (x2, y2), width)
+    # Stay out of the panel, which is only redrawn when it changes
+    previous_clip = win.get_clip()
+    win.set_clip(network_area())
+    
+    # Gradient background, pre-rendered for the current window size
+    win.blit(BACKGROUND_LAYER.surface(), (0, 0))
+    
+    # Draw connections first (so they appear behind users). Plain edges come
+    # from the cached layer; path edges and edges of vanishing nodes change
+    # every frame and are drawn on top of it.
+    camera = CAMERA
+    layer, offset = EDGE_LAYER.surface(network, camera)
+    win.blit(layer, offset)
+    
+    # A user's screen position is ((x - cam_x) * zoom, (y - cam_y) * zoom)
+    xs, ys, alphas = network.users.xs, network.users.ys, network.users.alphas
+    cam_x, cam_y, zoom = camera.x, camera.y, camera.zoom
+    
+    # Highlight path connections with animated effect
+    pulse = math.sin(current_time * 3) * 0.3 + 0.7
+    path_color = tuple(int(c * pulse) for c in HIGHLIGHT_PATH)
+    path = network.current_path
+    for user_id, connected_id in zip(path, path[1:]):
+        draw_connection(win, (xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom,
+                        (xs[connected_id] - cam_x) * zoom, (ys[connected_id] - cam_y) * zoom,
+                        path_color, 4, zoom)
+    
+    # Dim connections to vanishing nodes; the edge layer collected the ones in
+    # view (none when zoomed so far out that the layer has no edges either)
+    for user_id, connected_id in EDGE_LAYER.vanish_edges:
+        color = CONNECTION_COLOR
+        width = 2
+        
+        # Fade with the more faded end; nodes that finished vanishing are
+        # back at alpha 1 and leave their edges at full colour
+        alpha = min(alphas[user_id], alphas[connected_id])
+        if alpha < 1.0:
+            color = tuple(int(c * alpha) for c in color)
+            width = max(1, int(width * alpha))
+        
+        user_x, user_y = (xs[user_id] - cam_x) * zoom, (ys[user_id] - cam_y) * zoom
+        connected_x, connected_y = (xs[connected_id] - cam_x) * zoom, (ys[connected_id] - cam_y) * zoom
+        if camera.lod:
+            pygame.draw.line(win, color, (user_x, user_y), (connected_x, connected_y))
+        else:
+            draw_connection(win, user_x, user_y, connected_x, connected_y, color, width, zoom)
     
     # Draw users with enhanced styling and BFS visualization
-    for user in network.users.values():
-        user.update_animation(current_time)
+    # (only users in view; zoomed out, draw_users_lod handles them instead)
+    # (sorted so overlapping users stack the same way at every camera position)
+    visible_users = [] if camera.lod else sorted(network.users_in_rect(*camera.view_rect(margin=40)))
+    for user_id in visible_users:
+        user = network.users[user_id]
+        
+        # Screen position and size under the camera
+        user_x, user_y = (user.x - cam_x) * zoom, (user.y - cam_y) * zoom
+        user_radius = user.radius * zoom
         
         # Determine user color and size
         color = USER_COLOR
-        radius = user.radius
-        alpha = 1.0
+        radius = int(user_radius)
+        # Fade alpha, updated for all vanishing nodes by network.update_animation
+        alpha = alphas[user_id]
         
         # Check if node is vanishing
         if user.id in network.vanishing_nodes:
-            vanish_start = network.vanishing_nodes[user.id]
-            if current_time >= vanish_start:
-                vanish_progress = min(1.0, (current_time - vanish_start) / network.vanish_duration)
-                alpha = 1.0 - vanish_progress
+            if current_time >= network.vanishing_nodes[user.id]:
+                vanish_progress = 1.0 - alpha
                 
                 # Add sparkle effect during vanishing
                 if vanish_progress < 0.8:
@@ -795,11 +906,9 @@ def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: floa
                     sparkle_alpha = int(100 * (1 - vanish_progress))
                     for i in range(8):
                         angle = (i / 8) * 2 * math.pi + current_time * 5
-                        sparkle_x = user.x + math.cos(angle) * sparkle_radius
-                        sparkle_y = user.y + math.sin(angle) * sparkle_radius
-                        sparkle_color = (*PATH_COLOR, sparkle_alpha)
-                        s = pygame.Surface((6, 6), pygame.SRCALPHA)
-                        pygame.draw.circle(s, sparkle_color, (3, 3), 3)
+                        sparkle_x = user_x + math.cos(angle) * sparkle_radius
+                        sparkle_y = user_y + math.sin(angle) * sparkle_radius
+                        s = SPRITES.circle(PATH_COLOR, 3, sparkle_alpha)
                         win.blit(s, (sparkle_x - 3, sparkle_y - 3))
         
         # Skip drawing if completely vanished
@@ -811,46 +920,42 @@ def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: floa
             color = SELECTED_USER
             # Pulsing effect
             pulse = math.sin(user.pulse_phase) * 0.4 + 1.2
-            radius = int(user.radius * pulse)
+            radius = int(user_radius * pulse)
             
         elif user.is_target:
             color = TARGET_USER
             # Pulsing effect
             pulse = math.sin(user.pulse_phase) * 0.4 + 1.2
-            radius = int(user.radius * pulse)
+            radius = int(user_radius * pulse)
             
         elif user.id in network.current_exploring_nodes and network.is_animating_bfs:
             # Currently being explored by BFS
             color = (255, 255, 0)  # Yellow for active exploration
             pulse = math.sin(current_time * 8) * 0.3 + 1.1
-            radius = int(user.radius * pulse)
+            radius = int(user_radius * pulse)
             
             # Add exploration ripple effect
             ripple_radius = int(radius + (math.sin(current_time * 6) * 10 + 10))
             ripple_alpha = int(50 * (1 + math.sin(current_time * 6)) / 2)
-            ripple_color = (*color, ripple_alpha)
-            s = pygame.Surface((ripple_radius * 2, ripple_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, ripple_color, (ripple_radius, ripple_radius), ripple_radius, 3)
-            win.blit(s, (user.x - ripple_radius, user.y - ripple_radius))
+            s = SPRITES.circle(color, ripple_radius, ripple_alpha, 3)
+            win.blit(s, (user_x - ripple_radius, user_y - ripple_radius))
             
         elif user.id in network.bfs_visited_nodes and network.is_animating_bfs:
             # Already visited by BFS
             color = (100, 200, 255)  # Light blue for visited
-            radius = user.radius + 2
+            radius = int(user_radius) + 2
             
-        elif (network.current_path and user.id in network.current_path and 
+        elif (user.id in network.path_index and 
               network.bfs_complete):
             # Final path node
             color = PATH_COLOR
-            radius = user.radius + 3
+            radius = int(user_radius) + 3
             
             # Subtle glow for path users
             for glow_radius in range(radius + 8, radius, -2):
                 glow_alpha = max(0, int(30 * alpha) - (glow_radius - radius) * 4)
-                glow_color = (*PATH_COLOR, glow_alpha)
-                s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s, glow_color, (glow_radius, glow_radius), glow_radius)
-                win.blit(s, (user.x - glow_radius, user.y - glow_radius))
+                s = SPRITES.circle(PATH_COLOR, glow_radius, glow_alpha)
+                win.blit(s, (user_x - glow_radius, user_y - glow_radius))
         
         # Apply alpha for vanishing effect
         if alpha < 1.0:
@@ -860,27 +965,26 @@ def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: floa
         if user.is_selected or user.is_target:
             for glow_radius in range(radius + 15, radius, -3):
                 glow_alpha = max(0, int(50 * alpha) - (glow_radius - radius) * 3)
-                glow_color = (*color, glow_alpha)
-                s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s, glow_color, (glow_radius, glow_radius), glow_radius)
-                win.blit(s, (user.x - glow_radius, user.y - glow_radius))
+                s = SPRITES.circle(color, glow_radius, glow_alpha)
+                win.blit(s, (user_x - glow_radius, user_y - glow_radius))
         
         # Draw user circle with gradient effect
-        pygame.draw.circle(win, color, (int(user.x), int(user.y)), radius)
+        pygame.draw.circle(win, color, (int(user_x), int(user_y)), radius)
         
         # Add inner highlight
         highlight_color = tuple(min(255, int(c + 50 * alpha)) for c in color)
-        pygame.draw.circle(win, highlight_color, (int(user.x - 2), int(user.y - 2)), max(1, radius - 3))
+        pygame.draw.circle(win, highlight_color, (int(user_x - 2), int(user_y - 2)), max(1, radius - 3))
         
         # Draw border
         border_color = tuple(int(c * alpha) for c in TEXT_COLOR)
-        pygame.draw.circle(win, border_color, (int(user.x), int(user.y)), radius, 2)
+        pygame.draw.circle(win, border_color, (int(user_x), int(user_y)), radius, 2)
         
         # Draw user name for selected/target users with better styling
         if (user.is_selected or user.is_target) and alpha > 0.5:
-            # Background for text
-            text = FONT_SMALL.render(user.name, True, TEXT_COLOR)
-            text_rect = text.get_rect(center=(user.x, user.y - radius - 20))
+            # Text with alpha, rendered once and used for sizing the background too
+            text_color = tuple(int(c * alpha) for c in TEXT_COLOR)
+            text_surface = render_text(FONT_SMALL, user.name, text_color)
+            text_rect = text_surface.get_rect(center=(user_x, user_y - radius - 20))
             
             # Draw text background
             bg_rect = text_rect.inflate(8, 4)
@@ -890,18 +994,26 @@ def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: floa
             pygame.draw.rect(s, tuple(int(c * alpha) for c in color), 
                            (0, 0, bg_rect.width, bg_rect.height), 2, border_radius=4)
             win.blit(s, bg_rect.topleft)
-            
-            # Draw text with alpha
-            text_color = tuple(int(c * alpha) for c in TEXT_COLOR)
-            text_surface = FONT_SMALL.render(user.name, True, text_color)
             win.blit(text_surface, text_rect)
     
+    if camera.lod:
+        draw_users_lod(win, network, camera)
+    
+    if hover_user is not None:
+        draw_hover(win, network, hover_user, camera)
+    
+    if STATS_VIEW.visible:
+        win.blit(STATS_VIEW.surface(network), (20, HEIGHT - StatsView.SIZE[1] - 20))
+    
     # Draw BFS progress indicator
-    if network.is_animating_bfs and network.bfs_animation:
-        progress = network.animation_step / len(network.bfs_animation)
-        progress_text = f"BFS Progress: {int(progress * 100)}% (Level {network.animation_step}/{len(network.bfs_animation)})"
+    if network.is_animating_bfs and network.target_user is not None:
+        if network.animation_levels:
+            progress = network.animation_step / network.animation_levels
+            progress_text = f"BFS Progress: {int(progress * 100)}% (Level {network.animation_step}/{network.animation_levels})"
+        else:
+            progress_text = f"BFS Progress: Level {network.animation_step} ({network.nodes_explored} users explored)"
         
-        text_surface = FONT_MEDIUM.render(progress_text, True, (255, 255, 0))
+        text_surface = render_text(FONT_MEDIUM, progress_text, (255, 255, 0))
         text_rect = text_surface.get_rect()
         text_rect.centerx = WIDTH // 4
         text_rect.y = 30
@@ -912,13 +1024,53 @@ def draw_network(win: pygame.Surface, network: SocialNetwork, current_time: floa
         pygame.draw.rect(win, (255, 255, 0), bg_rect, 2, border_radius=5)
         
         win.blit(text_surface, text_rect)
+    
+    if busy_label:
+        draw_spinner(win, busy_label, current_time)
+    elif error_label:
+        draw_spinner(win, error_label, current_time, failed=True)
+    
+    win.set_clip(previous_clip)
 
-def main():
+def layout_size(num_users: int) -> Tuple[int, int]:
+    """Layout (width, height) for a network, including the panel width.
+    
+    Up to BASE_USERS the layout fits the window. Larger networks get a
+    proportionally larger layout, keeping the default density, and are
+    explored with the camera.
+    """
+    scale = max(1.0, math.sqrt(num_users / BASE_USERS))
+    width = PANEL_WIDTH + 200 + (WIDTH - PANEL_WIDTH - 200) * scale
+    height = 200 + (HEIGHT - 200) * scale
+    return int(width), int(height)
+
+
+def new_network(num_users: int, search_mode: str = "bfs") -> SocialNetwork:
+    """Generate a network sized for the current window and fit the camera to it"""
+    network = SocialNetwork(num_users, *layout_size(num_users), search_mode=search_mode)
+    CAMERA.fit(network)
+    return network
+
+
+def fit_network(network: SocialNetwork):
+    """Rescale an existing network to the current window, keeping graph and selection"""
+    network.rescale_layout(*layout_size(len(network.users)))
+    CAMERA.fit(network)
+
+
+def main(num_users: int = BASE_USERS):
+    global WIDTH, HEIGHT, WIN
     try:
+        init_display()
         clock = pygame.time.Clock()
-        network = SocialNetwork(300)
+        # Searches and regeneration run in the background; see poll() below
+        workers = WorkerPool()
+        network = new_network(num_users)
+        network.search_runner = workers.run_search
         ui = UI()
         running = True
+        # (message, time) of the last failed background job
+        job_error: Optional[Tuple[str, float]] = None
         is_fullscreen = False
         
         print("🇮🇳 इंडिग्राम - Indigram Social Network Visualization")
@@ -928,6 +1080,9 @@ def main():
         print("- Left click: Select start user, then target user")
         print("- R key: Reset selection")
         print("- Space key: Random demo")
+        print("- B key: Cycle search mode")
+        print("- S key: Toggle stats view")
+        print("- Mouse wheel / right-drag / arrow keys: Zoom and pan, 0: Reset view")
         print("- F11: Toggle fullscreen")
         print("- Use buttons in panel for actions")
         print("- Click 'Exit Indigram' button to quit")
@@ -936,7 +1091,7 @@ def main():
         return
     
     def toggle_fullscreen():
-        nonlocal is_fullscreen, ui, network
+        nonlocal is_fullscreen, ui
         global WIN, WIDTH, HEIGHT
         
         is_fullscreen = not is_fullscreen
@@ -953,8 +1108,8 @@ def main():
         
         # Recreate UI with new dimensions
         ui = UI()
-        # Regenerate network positions for new screen size
-        network = SocialNetwork(len(network.users))
+        # Stretch the existing layout to the new screen size
+        fit_network(network)
         print(f"Screen mode: {'Fullscreen' if is_fullscreen else 'Windowed'} ({WIDTH}x{HEIGHT})")
     
     while running:
@@ -970,11 +1125,10 @@ def main():
                 
                 elif event.type == pygame.VIDEORESIZE:
                     if not is_fullscreen:
-                        global WIDTH, HEIGHT, WIN
                         WIDTH, HEIGHT = event.w, event.h
                         WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
                         ui = UI()
-                        network = SocialNetwork(len(network.users))
+                        fit_network(network)
                 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
@@ -998,13 +1152,14 @@ def main():
                             running = False
                         elif ui.regenerate_button.collidepoint(mouse_pos):
                             print("Regenerating network...")
-                            network = SocialNetwork(300)
-                            print(f"New network generated with {len(network.users)} users")
+                            workers.generate(len(network.users), *layout_size(len(network.users)),
+                                             network.search_mode)
                         elif ui.fullscreen_button.collidepoint(mouse_pos):
                             toggle_fullscreen()
                         else:
                             # Check if clicking on a user
-                            clicked_user = network.get_user_at_position(mouse_pos[0], mouse_pos[1])
+                            world_x, world_y = CAMERA.to_world(*mouse_pos)
+                            clicked_user = network.get_user_at_position(world_x, world_y, slack=5 / CAMERA.zoom)
                             if clicked_user is not None and mouse_pos[0] < WIDTH - ui.panel_width:
                                 if network.selected_user is None:
                                     network.select_user(clicked_user)
@@ -1013,10 +1168,29 @@ def main():
                                     network.select_target(clicked_user)
                                     if network.path_found:
                                         print(f"Path found! Degrees of separation: {network.degrees_of_separation}")
-                                    else:
+                                    elif network.search_error is not None:
+                                        print(f"Search failed: {network.search_error}")
+                                    elif not network.search_pending:
                                         print("No path found between selected users")
                 
+                    elif event.button in (2, 3) and mouse_pos[0] < WIDTH - ui.panel_width:
+                        # Middle or right drag pans the view
+                        CAMERA.dragging = True
+                
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if event.button in (2, 3):
+                        CAMERA.dragging = False
+                
+                elif event.type == pygame.MOUSEMOTION:
+                    if CAMERA.dragging:
+                        CAMERA.pan(*event.rel)
+                
+                elif event.type == pygame.MOUSEWHEEL:
+                    if mouse_pos[0] < WIDTH - ui.panel_width:
+                        CAMERA.zoom_at(1.2 ** event.y, mouse_pos)
+                
                 elif event.type == pygame.KEYDOWN:
+                    view_center = ((WIDTH - ui.panel_width) // 2, HEIGHT // 2)
                     if event.key == pygame.K_r:
                         network.reset_selection()
                         print("Selection reset")
@@ -1031,28 +1205,90 @@ def main():
                         print(f"Random demo: {network.users[start_id].name} → {network.users[target_id].name}")
                         if network.path_found:
                             print(f"Degrees of separation: {network.degrees_of_separation}")
+                    elif event.key == pygame.K_b:
+                        # Cycle through one-sided, bidirectional, tree-reuse and frontier search
+                        next_mode = SEARCH_MODES.index(network.search_mode) + 1
+                        network.search_mode = SEARCH_MODES[next_mode % len(SEARCH_MODES)]
+                        print(f"Search mode: {network.search_mode}")
+                    elif event.key == pygame.K_s:
+                        STATS_VIEW.visible = not STATS_VIEW.visible
+                    elif event.key in PAN_KEYS:
+                        CAMERA.pan(*PAN_KEYS[event.key])
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        CAMERA.zoom_at(1.2, view_center)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        CAMERA.zoom_at(1 / 1.2, view_center)
+                    elif event.key in (pygame.K_0, pygame.K_HOME):
+                        CAMERA.fit(network)
                     elif event.key == pygame.K_F11:
                         toggle_fullscreen()
                     elif event.key == pygame.K_ESCAPE:
                         print("Indigram exited with ESC key")
                         running = False
             
+            # Pick up finished background jobs without waiting for any
+            for job, result, error in workers.poll():
+                if error is not None:
+                    # Keep the current state; the spinner area reports the failure
+                    action = "Regenerate" if job == "network" else "Statistics"
+                    message = f"{type(error).__name__}: {error}"
+                    if len(message) > 48:
+                        message = message[:48] + "..."
+                    job_error = (f"⚠️ {action} failed: {message}", current_time)
+                    print(f"{action} failed: {type(error).__name__}: {error}")
+                    if job == "separation":
+                        # Hidden so it is not resubmitted every frame
+                        STATS_VIEW.visible = False
+                elif job == "separation":
+                    STATS_VIEW.separation = result
+                elif job == "network":
+                    # A search left running would hold the only search thread
+                    network.cancel_search()
+                    network = result
+                    network.search_runner = workers.run_search
+                    # The window may have been resized while it was generated
+                    fit_network(network)
+                    print(f"New network generated with {len(network.users)} users")
+            
+            if STATS_VIEW.needs_separation(network) and not workers.busy("separation"):
+                workers.submit("separation", StatsView.compute_separation, network)
+            
             # Update
             ui.handle_mouse_hover(mouse_pos)
             network.update_animation(current_time)
             
+            # Picking is a grid lookup, cheap enough to follow the mouse every frame
+            hover_user = None
+            if mouse_pos[0] < WIDTH - ui.panel_width and not CAMERA.dragging:
+                world_x, world_y = CAMERA.to_world(*mouse_pos)
+                hover_user = network.get_user_at_position(world_x, world_y, slack=5 / CAMERA.zoom)
+            
+            busy_label = None
+            error_label = None
+            if job_error is not None and current_time - job_error[1] < JOB_ERROR_SECONDS:
+                error_label = job_error[0]
+            if workers.busy("network"):
+                busy_label = "Generating network..."
+            elif network.waiting_for_search:
+                busy_label = "Searching..."
+            elif STATS_VIEW.visible and workers.busy("separation"):
+                busy_label = "Computing statistics..."
+            
             # Draw
-            draw_network(WIN, network, current_time)
-            ui.draw_panel(WIN, network)
+            draw_network(WIN, network, current_time, hover_user, busy_label, error_label)
+            dirty = ui.draw_panel(WIN, network)
             
-            pygame.display.flip()
+            # The network area changes every frame; the panel only where it was redrawn
+            pygame.display.update([ui.network_rect] + dirty)
             clock.tick(60)
         except Exception as e:
             print(f"Error in main loop: {e}")
             break
     
+    workers.shutdown()
     pygame.quit()
     print("🇮🇳 इंडिग्राम समाप्त - Indigram visualization ended.")
 
 if __name__ == "__main__":
-    main()
+    # Optional user count, e.g. `python social_network_bfs.py 100000`
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else BASE_USERS)
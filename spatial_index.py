@@ -0,0 +1,251 @@
+"""Uniform-grid spatial index over user positions.
+
+Points are bucketed into square cells sized so that each cell holds a couple
+of points on average. Nearest-neighbour queries scan rings of cells outwards
+from the query cell and stop as soon as no unvisited cell can hold a closer
+point, so a query touches only a handful of cells instead of every user.
+Rectangle queries, used to draw only what is on screen, visit just the
+cells the rectangle covers; ``SegmentIndex`` does the same for edges.
+"""
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Only nearest_neighbors_batch needs NumPy
+    np = None
+
+
+class GridIndex:
+    def __init__(self, points: Iterable[Tuple[int, float, float]], points_per_cell: float = 2.0):
+        """Build the grid from (point_id, x, y) tuples"""
+        self.positions: Dict[int, Tuple[float, float]] = {
+            point_id: (x, y) for point_id, x, y in points
+        }
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+        if self.positions:
+            xs = [x for x, _ in self.positions.values()]
+            ys = [y for _, y in self.positions.values()]
+            self.min_x, self.min_y = min(xs), min(ys)
+            span_x = max(xs) - self.min_x
+            span_y = max(ys) - self.min_y
+        else:
+            self.min_x = self.min_y = 0.0
+            span_x = span_y = 0.0
+
+        # Pick a cell size giving roughly `points_per_cell` points per cell
+        area = max(span_x * span_y, 1.0)
+        self.cell_size = max(1.0, math.sqrt(area * points_per_cell / max(1, len(self.positions))))
+        self.cols = int(span_x / self.cell_size) + 1
+        self.rows = int(span_y / self.cell_size) + 1
+
+        for point_id, (x, y) in self.positions.items():
+            self.cells.setdefault(self.cell_of(x, y), []).append(point_id)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Grid cell containing the given position"""
+        return (int((x - self.min_x) // self.cell_size),
+                int((y - self.min_y) // self.cell_size))
+
+    def _ring(self, cx: int, cy: int, r: int) -> Iterable[Tuple[int, int]]:
+        """Cells at Chebyshev distance exactly r from (cx, cy)"""
+        if r == 0:
+            yield cx, cy
+            return
+        for col in range(cx - r, cx + r + 1):
+            yield col, cy - r
+            yield col, cy + r
+        for row in range(cy - r + 1, cy + r):
+            yield cx - r, row
+            yield cx + r, row
+
+    def nearest(self, x: float, y: float, k: int, exclude: Optional[int] = None) -> List[int]:
+        """Return the ids of the k points closest to (x, y), nearest first.
+
+        Ties are broken by id, matching a full sort of (distance, id) pairs.
+        """
+        if k <= 0:
+            return []
+
+        cx, cy = self.cell_of(x, y)
+        # Rings beyond this radius lie completely outside the grid
+        max_r = max(cx + 1, cy + 1, self.cols - cx, self.rows - cy)
+        cells = self.cells
+        positions = self.positions
+        candidates: List[Tuple[float, int]] = []
+
+        r = 0
+        while r <= max_r:
+            for cell in self._ring(cx, cy, r):
+                for point_id in cells.get(cell, ()):
+                    if point_id != exclude:
+                        px, py = positions[point_id]
+                        candidates.append((math.sqrt((px - x) ** 2 + (py - y) ** 2), point_id))
+
+            # Every unvisited cell is at least r cells away from the query
+            if len(candidates) >= k:
+                candidates.sort()
+                if candidates[k - 1][0] < r * self.cell_size:
+                    break
+            r += 1
+
+        candidates.sort()
+        return [point_id for _, point_id in candidates[:k]]
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Ids of all points inside the axis-aligned rectangle (bounds inclusive)"""
+        if not self.positions or x1 < x0 or y1 < y0:
+            return []
+        col0, row0 = self.cell_of(x0, y0)
+        col1, row1 = self.cell_of(x1, y1)
+        col0, row0 = max(col0, 0), max(row0, 0)
+        col1, row1 = min(col1, self.cols - 1), min(row1, self.rows - 1)
+
+        cells = self.cells
+        positions = self.positions
+        found = []
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                for point_id in cells.get((col, row), ()):
+                    px, py = positions[point_id]
+                    if x0 <= px <= x1 and y0 <= py <= y1:
+                        found.append(point_id)
+        return found
+
+
+class SegmentIndex:
+    """Uniform-grid index over line segments, for finding those that may cross a rectangle.
+
+    Each segment is filed under every cell its bounding box overlaps.
+    Segments spanning more than ``max_cells`` cells in either direction are
+    kept in a separate list and checked one by one, so a few long edges
+    don't fill the grid.
+    """
+
+    def __init__(self, segments: Iterable[Tuple[int, float, float, float, float]], cell_size: float,
+                 max_cells: int = 8):
+        """Build the grid from (segment_id, x1, y1, x2, y2) tuples"""
+        self.cell_size = max(1.0, cell_size)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.long_segments: List[Tuple[int, float, float, float, float]] = []
+
+        size = self.cell_size
+        for segment_id, x1, y1, x2, y2 in segments:
+            left, right = min(x1, x2), max(x1, x2)
+            top, bottom = min(y1, y2), max(y1, y2)
+            col0, col1 = int(left // size), int(right // size)
+            row0, row1 = int(top // size), int(bottom // size)
+            if col1 - col0 >= max_cells or row1 - row0 >= max_cells:
+                self.long_segments.append((segment_id, left, top, right, bottom))
+                continue
+            for col in range(col0, col1 + 1):
+                for row in range(row0, row1 + 1):
+                    self.cells.setdefault((col, row), []).append(segment_id)
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        """Ids of segments whose bounding box overlaps the rectangle"""
+        size = self.cell_size
+        found: Set[int] = set()
+        cells = self.cells
+        if len(cells) < (x1 - x0) * (y1 - y0) / (size * size):
+            # Cheaper to walk the occupied cells than the rectangle's cells
+            for (col, row), segment_ids in cells.items():
+                if x0 <= (col + 1) * size and col * size <= x1 and y0 <= (row + 1) * size and row * size <= y1:
+                    found.update(segment_ids)
+        else:
+            for col in range(int(x0 // size), int(x1 // size) + 1):
+                for row in range(int(y0 // size), int(y1 // size) + 1):
+                    found.update(cells.get((col, row), ()))
+
+        for segment_id, left, top, right, bottom in self.long_segments:
+            if left <= x1 and x0 <= right and top <= y1 and y0 <= bottom:
+                found.add(segment_id)
+        return found
+
+
+def nearest_neighbors_batch(xs, ys, query_ids, counts, points_per_cell: float = 2.0, chunk_size: int = 4096):
+    """Vectorized k-nearest-neighbour search for many points at once (requires NumPy).
+
+    ``xs``/``ys`` hold the coordinates of every point, indexed by point id.
+    Returns an array of shape ``(len(query_ids), max(counts))`` where row i
+    lists the ``counts[i]`` nearest neighbours of ``query_ids[i]`` (nearest
+    first, ties broken by id) padded with -1. The results are identical to
+    calling ``GridIndex.nearest`` once per query.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    query_ids = np.asarray(query_ids, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    max_count = int(counts.max()) if len(counts) else 0
+    result = np.full((len(query_ids), max_count), -1, dtype=np.int64)
+    if not len(xs) or max_count == 0:
+        return result
+
+    # Same grid geometry as GridIndex
+    min_x, min_y = xs.min(), ys.min()
+    span_x, span_y = xs.max() - min_x, ys.max() - min_y
+    area = max(span_x * span_y, 1.0)
+    cell_size = max(1.0, math.sqrt(area * points_per_cell / len(xs)))
+    cols = int(span_x / cell_size) + 1
+    rows = int(span_y / cell_size) + 1
+    cell_x = ((xs - min_x) // cell_size).astype(np.int64)
+    cell_y = ((ys - min_y) // cell_size).astype(np.int64)
+
+    # Table of point ids per cell, padded with -1. The extra last row is an
+    # empty cell that out-of-grid lookups are pointed at.
+    cell_key = cell_y * cols + cell_x
+    order = np.argsort(cell_key, kind="stable")
+    cell_counts = np.bincount(cell_key, minlength=cols * rows)
+    cell_start = np.cumsum(cell_counts) - cell_counts
+    slot = np.arange(len(xs)) - cell_start[cell_key[order]]
+    table = np.full((cols * rows + 1, int(cell_counts.max())), -1, dtype=np.int64)
+    table[cell_key[order], slot] = order
+
+    # Search a (2r+1)x(2r+1) block of cells around each query. Answers whose
+    # k-th distance reaches the block border are retried with a bigger block.
+    pending = np.arange(len(query_ids))
+    r = 1
+    while len(pending):
+        covers_grid = r >= max(cols, rows)
+        offsets = np.arange(-r, r + 1)
+        retry = []
+        for chunk_start in range(0, len(pending), chunk_size):
+            rows_idx = pending[chunk_start:chunk_start + chunk_size]
+            ids = query_ids[rows_idx]
+            k = counts[rows_idx]
+
+            block_x = cell_x[ids][:, None, None] + offsets[None, :, None]
+            block_y = cell_y[ids][:, None, None] + offsets[None, None, :]
+            inside = (block_x >= 0) & (block_x < cols) & (block_y >= 0) & (block_y < rows)
+            keys = np.where(inside, block_y * cols + block_x, cols * rows).reshape(len(ids), -1)
+            candidates = table[keys].reshape(len(ids), -1)
+
+            valid = (candidates >= 0) & (candidates != ids[:, None])
+            safe = np.where(valid, candidates, 0)
+            dist = np.sqrt((xs[safe] - xs[ids][:, None]) ** 2 + (ys[safe] - ys[ids][:, None]) ** 2)
+            dist[~valid] = np.inf
+            candidates = np.where(valid, candidates, np.iinfo(np.int64).max)
+
+            # Sort each row by (distance, id)
+            ranked = np.lexsort((candidates, dist), axis=-1)[:, :max_count]
+            best = np.take_along_axis(candidates, ranked, axis=1)
+            best_dist = np.take_along_axis(dist, ranked, axis=1)
+            if best.shape[1] < max_count:
+                pad = max_count - best.shape[1]
+                best = np.pad(best, ((0, 0), (0, pad)), constant_values=-1)
+                best_dist = np.pad(best_dist, ((0, 0), (0, pad)), constant_values=np.inf)
+
+            kth_dist = best_dist[np.arange(len(ids)), k - 1]
+            done = covers_grid | (kth_dist < r * cell_size)
+            keep = np.arange(max_count)[None, :] < k[:, None]
+            best = np.where(keep & np.isfinite(best_dist), best, -1)
+            result[rows_idx[done]] = best[done]
+            retry.append(rows_idx[~done])
+        pending = np.concatenate(retry)
+        r += 1
+
+    return result
@@ -0,0 +1,66 @@
+import time
+
+from social_network import SocialNetwork
+from workers import WorkerPool
+
+
+def start_far_search(network: SocialNetwork, pool: WorkerPool):
+    """Select user 0 and the user farthest from it, searching on the pool's thread"""
+    network.search_runner = pool.run_search
+    distances = {user_id: network.separation(0, user_id) for user_id in network.users}
+    target = max(distances, key=distances.get)
+    assert distances[target] >= 3
+    network.select_user(0)
+    network.select_target(target)
+    assert network.search_pending
+
+
+def play(network: SocialNetwork, until, timeout: float = 5.0):
+    """Step the animation with a fast clock until until() holds or timeout seconds pass"""
+    clock = time.time()
+    deadline = time.monotonic() + timeout
+    while not until() and time.monotonic() < deadline:
+        clock += network.animation_speed + 0.01
+        network.update_animation(clock)
+        time.sleep(0.005)
+    return until()
+
+
+def test_search_on_replacement_network_completes():
+    pool = WorkerPool()
+    try:
+        old = SocialNetwork(300, seed=1)
+        start_far_search(old, pool)
+        assert play(old, lambda: old.animation_step >= 1)
+        assert old.search_pending
+
+        # What the main loop does when a regenerated network arrives
+        old.cancel_search()
+        new = SocialNetwork(300, seed=2)
+        start_far_search(new, pool)
+        assert play(new, lambda: not new.search_pending)
+        assert new.path_found
+        assert new.search_error is None
+    finally:
+        pool.shutdown()
+
+
+def fail(message: str):
+    raise ValueError(message)
+
+
+def test_poll_returns_job_errors():
+    pool = WorkerPool()
+    try:
+        pool.submit("network", fail, "no layout")
+        deadline = time.monotonic() + 5
+        finished = []
+        while not finished and time.monotonic() < deadline:
+            finished = pool.poll()
+            time.sleep(0.01)
+        [(name, result, error)] = finished
+        assert (name, result) == ("network", None)
+        assert isinstance(error, ValueError)
+        assert not pool.busy("network")
+    finally:
+        pool.shutdown()
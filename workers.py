@@ -0,0 +1,171 @@
+"""Background jobs for the visualization, so the render loop never blocks.
+
+Path searches run on a worker thread and hand their BFS levels over one at
+a time through a queue, which the animation drains as it plays. Network
+generation runs in a worker process, where a multi-second build does not
+compete with the render loop for the GIL. Finished jobs land on a results
+queue that the main loop polls once per frame without waiting.
+"""
+import multiprocessing
+import queue
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from social_network import LEVEL_PENDING, SocialNetwork
+
+# Seconds a blocked search worker waits before checking for cancellation
+SEARCH_POLL_INTERVAL = 0.05
+
+
+class _SearchFinished:
+    __slots__ = ("path",)
+
+    def __init__(self, path: List[int]):
+        self.path = path
+
+
+class BackgroundSearch:
+    """Level source that runs a level generator on a worker thread.
+
+    Iterating never blocks: it returns LEVEL_PENDING until the worker has
+    produced the next level, and raises StopIteration with the path once
+    the search is done. The hand-over queue holds a single level, so the
+    worker stays about one level ahead of playback instead of buffering
+    the whole search. close() stops the worker after its current level.
+    """
+
+    def __init__(self, levels: Iterator[Sequence[int]], executor: ThreadPoolExecutor):
+        self.levels: "queue.Queue[Any]" = queue.Queue(maxsize=1)
+        self.cancelled = threading.Event()
+        self.future = executor.submit(self._run, levels)
+
+    def _put(self, item: Any) -> bool:
+        """Wait for room in the queue; False if the search was cancelled meanwhile"""
+        while not self.cancelled.is_set():
+            try:
+                self.levels.put(item, timeout=SEARCH_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self, levels: Iterator[Sequence[int]]):
+        try:
+            while self._put(next(levels)):
+                pass
+        except StopIteration as done:
+            self._put(_SearchFinished(done.value))
+        except Exception as error:
+            self._put(error)
+        finally:
+            levels.close()
+
+    def __iter__(self) -> "BackgroundSearch":
+        return self
+
+    def __next__(self) -> Sequence[int]:
+        try:
+            item = self.levels.get_nowait()
+        except queue.Empty:
+            return LEVEL_PENDING
+        if isinstance(item, _SearchFinished):
+            raise StopIteration(item.path)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self):
+        self.cancelled.set()
+
+
+def build_network(num_users: int, width: int, height: int, search_mode: str) -> SocialNetwork:
+    """Generate a network; runs in the worker process.
+
+    The spatial grids are built here too, so the main thread does not stall
+    on them when the network is first drawn.
+    """
+    network = SocialNetwork(num_users, width, height, search_mode=search_mode)
+    network.build_grids()
+    return network
+
+
+class WorkerPool:
+    """One search thread and one generation process, plus the results queue.
+
+    Jobs are submitted under a name; a newer job with the same name
+    supersedes the older one, whose result is dropped when it arrives.
+    """
+
+    def __init__(self):
+        self.threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="indigram-search")
+        # Started on first use; spawn keeps the child free of the display state
+        self.processes = None
+        self.results: "queue.Queue[Tuple[str, int, Future]]" = queue.Queue()
+        self.pending: Dict[str, int] = {}
+        self.job_count = 0
+        # Searches whose worker may still be running, closed on shutdown
+        self.searches: "weakref.WeakSet[BackgroundSearch]" = weakref.WeakSet()
+        # Jobs that may not have started yet, cancelled on shutdown
+        self.futures: "weakref.WeakSet[Future]" = weakref.WeakSet()
+
+    def run_search(self, levels: Iterator[Sequence[int]]) -> BackgroundSearch:
+        """SocialNetwork.search_runner that moves searches onto the worker thread"""
+        search = BackgroundSearch(levels, self.threads)
+        self.searches.add(search)
+        self.futures.add(search.future)
+        return search
+
+    def submit(self, name: str, function: Callable, *args, process: bool = False):
+        """Run function(*args) on the worker thread, or in the worker process"""
+        if process:
+            if self.processes is None:
+                self.processes = ProcessPoolExecutor(max_workers=1,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            executor = self.processes
+        else:
+            executor = self.threads
+        self.job_count += 1
+        job_id = self.pending[name] = self.job_count
+        future = executor.submit(function, *args)
+        self.futures.add(future)
+        future.add_done_callback(lambda done: self.results.put((name, job_id, done)))
+
+    def generate(self, num_users: int, width: int, height: int, search_mode: str):
+        """Build a network in the worker process; it arrives as a "network" result"""
+        self.submit("network", build_network, num_users, width, height, search_mode, process=True)
+
+    def busy(self, name: str) -> bool:
+        return name in self.pending
+
+    def poll(self) -> List[Tuple[str, Any, Optional[Exception]]]:
+        """(name, result, error) for every current job that finished since the last poll.
+
+        A job that raised comes back with result None and the exception as
+        error, so one failed job does not take down the main loop.
+        """
+        finished = []
+        while True:
+            try:
+                name, job_id, future = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+            if self.pending.get(name) != job_id:
+                continue
+            del self.pending[name]
+            try:
+                finished.append((name, future.result(), None))
+            except Exception as error:
+                finished.append((name, None, error))
+
+    def shutdown(self):
+        # A worker blocked on a full queue only exits once its search is closed
+        for search in list(self.searches):
+            search.close()
+        # Executor.shutdown only cancels queued jobs itself from Python 3.9 on
+        for future in list(self.futures):
+            future.cancel()
+        self.threads.shutdown(wait=False)
+        if self.processes is not None:
+            self.processes.shutdown(wait=False)